@@ -0,0 +1,84 @@
+"""archive tables for soft-deleted master data
+
+Revision ID: 2b8e6f4a1c93
+Revises: f7a3c5e1b864
+Create Date: 2025-10-25 11:48:20.935164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e6f4a1c93'
+down_revision: Union[str, Sequence[str], None] = 'f7a3c5e1b864'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('arc_activity_categories',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_by', sa.String(), nullable=True),
+    sa.Column('updated_by', sa.String(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Waktu dipindah ke arsip'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('arc_performance_standards',
+    sa.Column('category_id', sa.UUID(), nullable=False, comment='ID Kategori Aktivitas'),
+    sa.Column('name', sa.String(), nullable=False, comment='Nama Standar'),
+    sa.Column('description', sa.Text(), nullable=True, comment='Deskripsi Standar'),
+    sa.Column('evaluation_method', postgresql.ENUM('MANUAL', 'SYSTEM', name='performancestandardsevaluationmethod', create_type=False), nullable=False, comment='Metode Penilaian'),
+    sa.Column('scoring_rules', sa.JSON(), nullable=True, comment='Aturan Penilaian Sistem (JSON)'),
+    sa.Column('evaluation_guide', sa.Text(), nullable=True, comment='Panduan Penilaian PM'),
+    sa.Column('weight_percentage', sa.DECIMAL(precision=5, scale=2), nullable=False, comment='Bobot Persentase'),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_by', sa.String(), nullable=True),
+    sa.Column('updated_by', sa.String(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Waktu dipindah ke arsip'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_arc_performance_standards_category_id', 'arc_performance_standards', ['category_id'], unique=False)
+    # Index pendukung pemilihan kandidat arsip dan pengecekan referensi
+    op.create_index('ix_ref_performance_standards_category_id', 'ref_performance_standards', ['category_id'], unique=False)
+    op.create_index(
+        'ix_ref_performance_standards_deleted_at',
+        'ref_performance_standards',
+        ['deleted_at'],
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_ref_activity_categories_deleted_at',
+        'ref_activity_categories',
+        ['deleted_at'],
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_trx_activity_records_standard',
+        'trx_activity_records',
+        ['standard_id'],
+        postgresql_where=sa.text('standard_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trx_activity_records_standard', table_name='trx_activity_records')
+    op.drop_index('ix_ref_activity_categories_deleted_at', table_name='ref_activity_categories')
+    op.drop_index('ix_ref_performance_standards_deleted_at', table_name='ref_performance_standards')
+    op.drop_index('ix_ref_performance_standards_category_id', table_name='ref_performance_standards')
+    op.drop_index('ix_arc_performance_standards_category_id', table_name='arc_performance_standards')
+    op.drop_table('arc_performance_standards')
+    op.drop_table('arc_activity_categories')
@@ -0,0 +1,50 @@
+"""keyset pagination indexes
+
+Revision ID: 3f1c9a7d2b40
+Revises: 8ca242fbad48
+Create Date: 2025-10-20 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '8ca242fbad48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_ref_activity_categories_name_id',
+        'ref_activity_categories',
+        ['name', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_ref_performance_standards_name_id',
+        'ref_performance_standards',
+        ['name', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_ref_performance_standards_category_name_id',
+        'ref_performance_standards',
+        ['category_id', 'name', 'id'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ref_performance_standards_category_name_id', table_name='ref_performance_standards')
+    op.drop_index('ix_ref_performance_standards_name_id', table_name='ref_performance_standards')
+    op.drop_index('ix_ref_activity_categories_name_id', table_name='ref_activity_categories')
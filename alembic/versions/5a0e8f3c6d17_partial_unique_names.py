@@ -0,0 +1,44 @@
+"""case-insensitive partial unique names
+
+Revision ID: 5a0e8f3c6d17
+Revises: b7e2d4c91a05
+Create Date: 2025-10-21 15:40:52.817330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a0e8f3c6d17'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4c91a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('ref_activity_categories_name_key', 'ref_activity_categories', type_='unique')
+    op.create_index(
+        'uq_ref_activity_categories_name_lower',
+        'ref_activity_categories',
+        [sa.text('lower(name)')],
+        unique=True,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'uq_ref_performance_standards_category_name_lower',
+        'ref_performance_standards',
+        ['category_id', sa.text('lower(name)')],
+        unique=True,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_ref_performance_standards_category_name_lower', table_name='ref_performance_standards')
+    op.drop_index('uq_ref_activity_categories_name_lower', table_name='ref_activity_categories')
+    op.create_unique_constraint('ref_activity_categories_name_key', 'ref_activity_categories', ['name'])
@@ -0,0 +1,37 @@
+"""row version for optimistic concurrency
+
+Revision ID: 6d9f2b5e8a41
+Revises: 2b8e6f4a1c93
+Create Date: 2025-10-27 16:22:11.054398
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d9f2b5e8a41'
+down_revision: Union[str, Sequence[str], None] = '2b8e6f4a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    'ref_activity_categories',
+    'ref_performance_standards',
+    'arc_activity_categories',
+    'arc_performance_standards',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'version')
@@ -0,0 +1,75 @@
+"""per-category weight totals maintained by trigger
+
+Revision ID: 9c4d1e7f2a38
+Revises: 5a0e8f3c6d17
+Create Date: 2025-10-22 10:12:37.402115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d1e7f2a38'
+down_revision: Union[str, Sequence[str], None] = '5a0e8f3c6d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'agg_category_weights',
+        sa.Column('category_id', postgresql.UUID(as_uuid=True), nullable=False, comment='ID Kategori Aktivitas'),
+        sa.Column('weight_total', sa.DECIMAL(precision=10, scale=2), server_default='0', nullable=False, comment='Total bobot standar aktif'),
+        sa.Column('standards_count', sa.Integer(), server_default='0', nullable=False, comment='Jumlah standar aktif'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['ref_activity_categories.id'], ),
+        sa.PrimaryKeyConstraint('category_id'),
+    )
+    op.execute("""
+        INSERT INTO agg_category_weights (category_id, weight_total, standards_count)
+        SELECT category_id, sum(weight_percentage), count(*)
+        FROM ref_performance_standards
+        WHERE deleted_at IS NULL
+        GROUP BY category_id
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION agg_category_weights_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+                INSERT INTO agg_category_weights AS w (category_id, weight_total, standards_count)
+                VALUES (OLD.category_id, -OLD.weight_percentage, -1)
+                ON CONFLICT (category_id) DO UPDATE
+                SET weight_total = w.weight_total + EXCLUDED.weight_total,
+                    standards_count = w.standards_count + EXCLUDED.standards_count,
+                    updated_at = now();
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+                INSERT INTO agg_category_weights AS w (category_id, weight_total, standards_count)
+                VALUES (NEW.category_id, NEW.weight_percentage, 1)
+                ON CONFLICT (category_id) DO UPDATE
+                SET weight_total = w.weight_total + EXCLUDED.weight_total,
+                    standards_count = w.standards_count + EXCLUDED.standards_count,
+                    updated_at = now();
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_ref_performance_standards_weights
+        AFTER INSERT OR DELETE OR UPDATE OF category_id, weight_percentage, deleted_at
+        ON ref_performance_standards
+        FOR EACH ROW EXECUTE FUNCTION agg_category_weights_apply()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_ref_performance_standards_weights ON ref_performance_standards")
+    op.execute("DROP FUNCTION IF EXISTS agg_category_weights_apply()")
+    op.drop_table('agg_category_weights')
@@ -0,0 +1,61 @@
+"""trigram and full-text search indexes
+
+Revision ID: b7e2d4c91a05
+Revises: 3f1c9a7d2b40
+Create Date: 2025-10-21 10:03:17.204511
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4c91a05'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('ref_performance_standards', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(evaluation_guide, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+        comment='Dokumen full-text search',
+    ))
+    op.create_index(
+        'ix_ref_activity_categories_name_trgm', 'ref_activity_categories', ['name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_ref_performance_standards_name_trgm', 'ref_performance_standards', ['name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_ref_performance_standards_description_trgm', 'ref_performance_standards', ['description'],
+        unique=False, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_ref_performance_standards_search_vector', 'ref_performance_standards', ['search_vector'],
+        unique=False, postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ref_performance_standards_search_vector', table_name='ref_performance_standards')
+    op.drop_index('ix_ref_performance_standards_description_trgm', table_name='ref_performance_standards')
+    op.drop_index('ix_ref_performance_standards_name_trgm', table_name='ref_performance_standards')
+    op.drop_index('ix_ref_activity_categories_name_trgm', table_name='ref_activity_categories')
+    op.drop_column('ref_performance_standards', 'search_vector')
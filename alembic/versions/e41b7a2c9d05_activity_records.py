@@ -0,0 +1,54 @@
+"""activity records
+
+Revision ID: e41b7a2c9d05
+Revises: 9c4d1e7f2a38
+Create Date: 2025-10-23 09:31:04.118527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7a2c9d05'
+down_revision: Union[str, Sequence[str], None] = '9c4d1e7f2a38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('trx_activity_records',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False, comment='ID user Keycloak'),
+    sa.Column('category_id', sa.UUID(), nullable=False, comment='ID Kategori Aktivitas'),
+    sa.Column('standard_id', sa.UUID(), nullable=True, comment='ID Standar Kinerja'),
+    sa.Column('event_id', sa.String(length=100), nullable=True, comment='ID event dari klien, untuk dedup saat retry'),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False, comment='Waktu mulai aktivitas'),
+    sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True, comment='Waktu selesai aktivitas'),
+    sa.Column('metrics', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False, comment='Nilai metric aktivitas'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['ref_activity_categories.id'], ),
+    sa.ForeignKeyConstraint(['standard_id'], ['ref_performance_standards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_trx_activity_records_user_event',
+        'trx_activity_records',
+        ['user_id', 'event_id'],
+        unique=True,
+        postgresql_where=sa.text('event_id IS NOT NULL'),
+    )
+    op.create_index('ix_trx_activity_records_user_started', 'trx_activity_records', ['user_id', 'started_at'], unique=False)
+    op.create_index('ix_trx_activity_records_category_started', 'trx_activity_records', ['category_id', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trx_activity_records_category_started', table_name='trx_activity_records')
+    op.drop_index('ix_trx_activity_records_user_started', table_name='trx_activity_records')
+    op.drop_index('uq_trx_activity_records_user_event', table_name='trx_activity_records')
+    op.drop_table('trx_activity_records')
@@ -0,0 +1,52 @@
+"""activity rollups and watermarks
+
+Revision ID: f7a3c5e1b864
+Revises: e41b7a2c9d05
+Create Date: 2025-10-24 14:05:49.671203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a3c5e1b864'
+down_revision: Union[str, Sequence[str], None] = 'e41b7a2c9d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('agg_activity_rollups',
+    sa.Column('period', sa.String(length=5), nullable=False, comment='day, week atau month'),
+    sa.Column('user_id', sa.String(), nullable=False, comment='ID user Keycloak'),
+    sa.Column('period_start', sa.Date(), nullable=False, comment='Tanggal awal periode'),
+    sa.Column('category_id', sa.UUID(), nullable=False, comment='ID Kategori Aktivitas'),
+    sa.Column('standard_id', sa.UUID(), nullable=False, comment='ID Standar Kinerja, UUID nol bila tanpa standar'),
+    sa.Column('event_count', sa.Integer(), server_default='0', nullable=False, comment='Jumlah event'),
+    sa.Column('duration_seconds', sa.Float(), server_default='0', nullable=False, comment='Total durasi aktivitas'),
+    sa.Column('score_sum', sa.Float(), server_default='0', nullable=False, comment='Total skor event yang dinilai sistem'),
+    sa.Column('scored_count', sa.Integer(), server_default='0', nullable=False, comment='Jumlah event yang dinilai sistem'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('period', 'user_id', 'period_start', 'category_id', 'standard_id')
+    )
+    op.create_index('ix_agg_activity_rollups_category', 'agg_activity_rollups', ['period', 'category_id', 'period_start'], unique=False)
+    op.create_table('agg_rollup_watermarks',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_id', sa.UUID(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index('ix_trx_activity_records_created_id', 'trx_activity_records', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trx_activity_records_created_id', table_name='trx_activity_records')
+    op.drop_table('agg_rollup_watermarks')
+    op.drop_index('ix_agg_activity_rollups_category', table_name='agg_activity_rollups')
+    op.drop_table('agg_activity_rollups')
@@ -1,11 +1,18 @@
-import requests
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import httpx
 from functools import lru_cache
-from keycloak import KeycloakOpenID
 from keycloak import KeycloakAdmin, KeycloakOpenID
-from keycloak.exceptions import KeycloakAuthenticationError
-from app.core.config import settings
+from keycloak.exceptions import KeycloakAuthenticationError, KeycloakError
 
 from app.core.config import settings
+from app.core.keycloak_async import AsyncKeycloakOpenID
+
+T = TypeVar("T")
 
 @lru_cache(maxsize=1)
 def get_keycloak_openid() -> KeycloakOpenID:
@@ -19,40 +26,188 @@ def get_keycloak_openid() -> KeycloakOpenID:
 def get_openid_config():
     return get_keycloak_openid().well_known()
 
+def get_realm_url() -> str:
+    return f"{settings.keycloak_server_url.rstrip('/')}/realms/{settings.keycloak_realm}"
+
+def get_issuer() -> str:
+    return settings.keycloak_issuer or get_realm_url()
+
 @lru_cache(maxsize=1)
-def get_jwks():
-    jwks_url = (
-        f"{settings.keycloak_server_url}"
-        f"realms/{settings.keycloak_realm}/protocol/openid-connect/certs"
+def get_async_keycloak() -> AsyncKeycloakOpenID:
+    return AsyncKeycloakOpenID(
+        realm_url=get_realm_url(),
+        client_id=settings.keycloak_client_id,
+        client_secret=settings.keycloak_client_secret,
+        timeout=httpx.Timeout(
+            settings.keycloak_http_timeout_seconds,
+            connect=settings.keycloak_http_connect_timeout_seconds,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.keycloak_http_max_connections,
+            max_keepalive_connections=settings.keycloak_http_max_keepalive_connections,
+        ),
     )
-    response = requests.get(jwks_url, timeout=5)
-    response.raise_for_status()
-    return response.json()
 
-def get_keycloak_admin() -> KeycloakAdmin:
-    if settings.keycloak_use_service_account:
-        try:
-            return KeycloakAdmin(
+async def close_async_keycloak() -> None:
+    if get_async_keycloak.cache_info().currsize:
+        await get_async_keycloak().aclose()
+        get_async_keycloak.cache_clear()
+
+
+class JWKSCache:
+    """Signing keys realm, di-index per `kid`.
+
+    Key di-refresh setelah `ttl_seconds`, atau lebih cepat ketika token membawa
+    `kid` yang belum dikenal (rotasi key). Refetch karena `kid` asing dibatasi
+    `min_refresh_seconds` supaya token sampah tidak membanjiri Keycloak.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        min_refresh_seconds: int,
+        jwks: Optional[Dict[str, Any]] = None,
+    ):
+        self._ttl = ttl_seconds
+        self._min_refresh = min_refresh_seconds
+        self._lock = asyncio.Lock()
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        if jwks:
+            self._load(jwks)
+
+    def _load(self, jwks: Dict[str, Any]) -> None:
+        self._keys = {
+            key["kid"]: key
+            for key in jwks.get("keys", [])
+            if key.get("kid") and key.get("use", "sig") == "sig"
+        }
+        self._fetched_at = time.monotonic()
+
+    async def prefetch(self, jwks: Optional[Dict[str, Any]] = None) -> None:
+        async with self._lock:
+            self._load(jwks if jwks is not None else await get_async_keycloak().certs())
+
+    def keys(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._keys)
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not kid:
+            return None
+        key = self._keys.get(kid)
+        if key is not None and self._fetched_at is not None and time.monotonic() - self._fetched_at < self._ttl:
+            return key
+        async with self._lock:
+            now = time.monotonic()
+            age = None if self._fetched_at is None else now - self._fetched_at
+            key = self._keys.get(kid)
+            if key is not None and age is not None and age < self._ttl:
+                return key
+            if key is None and age is not None and age < self._min_refresh:
+                return None
+            try:
+                self._load(await get_async_keycloak().certs())
+            except Exception:
+                # Keycloak tidak bisa dihubungi: pakai key lama kalau masih ada
+                if key is not None:
+                    return key
+                raise
+            return self._keys.get(kid)
+
+
+@lru_cache(maxsize=1)
+def get_jwks_cache() -> JWKSCache:
+    return JWKSCache(
+        ttl_seconds=settings.keycloak_jwks_ttl_seconds,
+        min_refresh_seconds=settings.keycloak_jwks_min_refresh_seconds,
+        jwks=json.loads(settings.keycloak_jwks) if settings.keycloak_jwks else None,
+    )
+
+def get_jwks() -> Dict[str, Any]:
+    return {"keys": list(get_jwks_cache().keys().values())}
+
+class KeycloakAdminProvider:
+    """Satu `KeycloakAdmin` per proses yang token admin-nya diperbarui sebelum kedaluwarsa.
+
+    Service account dicoba lebih dulu setiap kali token perlu diambil ulang;
+    username/password admin hanya dipakai kalau grant service account gagal.
+    """
+
+    def __init__(self, refresh_margin_seconds: int):
+        self._refresh_margin = refresh_margin_seconds
+        self._lock = threading.Lock()
+        self._admin: Optional[KeycloakAdmin] = None
+        self._is_service_account = False
+        self._expires_at = 0.0
+
+    def get(self) -> KeycloakAdmin:
+        if self._admin is not None and time.time() < self._expires_at - self._refresh_margin:
+            return self._admin
+        with self._lock:
+            if self._admin is None or time.time() >= self._expires_at - self._refresh_margin:
+                self._admin = self._connect()
+                self._expires_at = time.time() + int(self._admin.connection.token.get("expires_in", 60))
+            return self._admin
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+
+    def _connect(self) -> KeycloakAdmin:
+        if settings.keycloak_use_service_account:
+            try:
+                admin = self._admin if self._is_service_account else KeycloakAdmin(
+                    server_url=settings.keycloak_server_url,
+                    realm_name=settings.keycloak_realm,
+                    client_id=settings.keycloak_client_id,
+                    client_secret_key=settings.keycloak_client_secret,
+                    verify=True,
+                )
+                admin.connection.get_token()
+                self._is_service_account = True
+                return admin
+            except KeycloakAuthenticationError:
+                pass
+
+        if settings.keycloak_admin_username and settings.keycloak_admin_password:
+            admin = KeycloakAdmin(
                 server_url=settings.keycloak_server_url,
                 realm_name=settings.keycloak_realm,
-                client_id=settings.keycloak_client_id,
-                client_secret_key=settings.keycloak_client_secret,
+                user_realm_name=settings.keycloak_realm,
+                username=settings.keycloak_admin_username,
+                password=settings.keycloak_admin_password,
                 verify=True,
             )
-        except KeycloakAuthenticationError:
-            pass
-
-    if settings.keycloak_admin_username and settings.keycloak_admin_password:
-        return KeycloakAdmin(
-            server_url=settings.keycloak_server_url,
-            realm_name=settings.keycloak_realm,
-            user_realm_name=settings.keycloak_realm,
-            username=settings.keycloak_admin_username,
-            password=settings.keycloak_admin_password,
-            verify=True,
+            admin.connection.get_token()
+            self._is_service_account = False
+            return admin
+
+        raise RuntimeError(
+            "Keycloak admin not configured: enable service account or set "
+            "KEYCLOAK_ADMIN_USERNAME/KEYCLOAK_ADMIN_PASSWORD."
         )
 
-    raise RuntimeError(
-        "Keycloak admin not configured: enable service account or set "
-        "KEYCLOAK_ADMIN_USERNAME/KEYCLOAK_ADMIN_PASSWORD."
+
+@lru_cache(maxsize=1)
+def get_keycloak_admin_provider() -> KeycloakAdminProvider:
+    return KeycloakAdminProvider(
+        refresh_margin_seconds=settings.keycloak_admin_token_refresh_margin_seconds,
     )
+
+def get_keycloak_admin() -> KeycloakAdmin:
+    return get_keycloak_admin_provider().get()
+
+def call_keycloak_admin(call: Callable[[KeycloakAdmin], T]) -> T:
+    """Jalankan panggilan admin API (blocking, panggil lewat threadpool).
+
+    Token admin yang ditolak Keycloak sebelum `expires_in` (sesi di-logout, key
+    realm dirotasi) dibuang lalu panggilan diulang sekali dengan token baru.
+    """
+    provider = get_keycloak_admin_provider()
+    try:
+        return call(provider.get())
+    except KeycloakError as e:
+        if not isinstance(e, KeycloakAuthenticationError) and getattr(e, "response_code", None) != 401:
+            raise
+        provider.invalidate()
+        return call(provider.get())
@@ -10,7 +10,62 @@ class Settings(BaseSettings):
     keycloak_admin_username: Optional[str] = Field(None, env="KEYCLOAK_ADMIN_USERNAME")
     keycloak_admin_password: Optional[str] = Field(None, env="KEYCLOAK_ADMIN_PASSWORD")
     keycloak_use_service_account: bool = Field(True, env="KEYCLOAK_USE_SERVICE_ACCOUNT")
+    keycloak_admin_token_refresh_margin_seconds: int = Field(30, env="KEYCLOAK_ADMIN_TOKEN_REFRESH_MARGIN_SECONDS")
+    # "local" = verifikasi signature/claims dengan JWKS, "introspect" = tanya Keycloak tiap request
+    keycloak_token_verification: str = Field("local", env="KEYCLOAK_TOKEN_VERIFICATION")
+    keycloak_issuer: Optional[str] = Field(None, env="KEYCLOAK_ISSUER")
+    keycloak_audience: Optional[str] = Field(None, env="KEYCLOAK_AUDIENCE")
+    keycloak_jwks: Optional[str] = Field(None, env="KEYCLOAK_JWKS")
+    keycloak_jwks_ttl_seconds: int = Field(3600, env="KEYCLOAK_JWKS_TTL_SECONDS")
+    keycloak_jwks_min_refresh_seconds: int = Field(30, env="KEYCLOAK_JWKS_MIN_REFRESH_SECONDS")
+    keycloak_http_timeout_seconds: float = Field(5.0, env="KEYCLOAK_HTTP_TIMEOUT_SECONDS")
+    keycloak_http_connect_timeout_seconds: float = Field(2.0, env="KEYCLOAK_HTTP_CONNECT_TIMEOUT_SECONDS")
+    keycloak_http_max_connections: int = Field(100, env="KEYCLOAK_HTTP_MAX_CONNECTIONS")
+    keycloak_http_max_keepalive_connections: int = Field(20, env="KEYCLOAK_HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    token_cache_max_entries: int = Field(10000, env="TOKEN_CACHE_MAX_ENTRIES")
+    token_cache_ttl_seconds: int = Field(300, env="TOKEN_CACHE_TTL_SECONDS")
+    rbac_policy_file: Optional[str] = Field(None, env="RBAC_POLICY_FILE")
+    rbac_policy_check_interval_seconds: int = Field(30, env="RBAC_POLICY_CHECK_INTERVAL_SECONDS")
+    user_bulk_concurrency: int = Field(8, env="USER_BULK_CONCURRENCY")
+    user_bulk_max_rows: int = Field(5000, env="USER_BULK_MAX_ROWS")
+    list_count_cache_max_entries: int = Field(1024, env="LIST_COUNT_CACHE_MAX_ENTRIES")
+    list_count_cache_ttl_seconds: int = Field(60, env="LIST_COUNT_CACHE_TTL_SECONDS")
+    list_cache_max_entries: int = Field(2048, env="LIST_CACHE_MAX_ENTRIES")
+    list_cache_ttl_seconds: int = Field(60, env="LIST_CACHE_TTL_SECONDS")
+    list_cache_max_bytes: int = Field(64 * 1024 * 1024, env="LIST_CACHE_MAX_BYTES")
+    etag_version_ttl_seconds: float = Field(2.0, env="ETAG_VERSION_TTL_SECONDS")
+    import_max_rows: int = Field(10000, env="IMPORT_MAX_ROWS")
+    import_batch_size: int = Field(500, env="IMPORT_BATCH_SIZE")
+    export_batch_size: int = Field(1000, env="EXPORT_BATCH_SIZE")
+    batch_max_items: int = Field(1000, env="BATCH_MAX_ITEMS")
+    enforce_category_weight_limit: bool = Field(False, env="ENFORCE_CATEGORY_WEIGHT_LIMIT")
+    scoring_rule_cache_max_entries: int = Field(1024, env="SCORING_RULE_CACHE_MAX_ENTRIES")
+    scoring_rule_cache_ttl_seconds: int = Field(3600, env="SCORING_RULE_CACHE_TTL_SECONDS")
+    scoring_max_rows: int = Field(100000, env="SCORING_MAX_ROWS")
+    activity_ingest_max_events: int = Field(10000, env="ACTIVITY_INGEST_MAX_EVENTS")
+    activity_buffer_max_events: int = Field(50000, env="ACTIVITY_BUFFER_MAX_EVENTS")
+    activity_flush_size: int = Field(1000, env="ACTIVITY_FLUSH_SIZE")
+    activity_flush_interval_seconds: float = Field(1.0, env="ACTIVITY_FLUSH_INTERVAL_SECONDS")
+    activity_enqueue_timeout_seconds: float = Field(5.0, env="ACTIVITY_ENQUEUE_TIMEOUT_SECONDS")
+    # "inline" = rollup diperbarui saat flush ingestion, "job" = job catch-up berbasis watermark
+    activity_rollup_mode: str = Field("inline", env="ACTIVITY_ROLLUP_MODE")
+    activity_rollup_timezone: str = Field("UTC", env="ACTIVITY_ROLLUP_TIMEZONE")
+    activity_rollup_interval_seconds: float = Field(30.0, env="ACTIVITY_ROLLUP_INTERVAL_SECONDS")
+    activity_rollup_lag_seconds: float = Field(30.0, env="ACTIVITY_ROLLUP_LAG_SECONDS")
+    activity_rollup_batch_size: int = Field(5000, env="ACTIVITY_ROLLUP_BATCH_SIZE")
+    archive_retention_days: int = Field(90, env="ARCHIVE_RETENTION_DAYS")
+    archive_batch_size: int = Field(500, env="ARCHIVE_BATCH_SIZE")
+    archive_batch_pause_seconds: float = Field(0.1, env="ARCHIVE_BATCH_PAUSE_SECONDS")
+    # 0 = job arsip otomatis dimatikan, hanya lewat endpoint /system/archive
+    archive_interval_seconds: float = Field(3600.0, env="ARCHIVE_INTERVAL_SECONDS")
     database_url: str = Field(..., env="DATABASE_URL")
+    # "queue" = pool koneksi di aplikasi, "null" = tanpa pool (mis. di belakang pgbouncer)
+    db_pool_class: str = Field("queue", env="DB_POOL_CLASS")
+    db_pool_size: int = Field(10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(True, env="DB_POOL_PRE_PING")
 
     class Config:
         env_file = ".env"
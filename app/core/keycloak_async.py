@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+class KeycloakHTTPError(Exception):
+    def __init__(self, status_code: int, body: Any):
+        self.status_code = status_code
+        self.body = body
+        super().__init__(f"Keycloak responded {status_code}: {body}")
+
+
+class KeycloakInvalidGrantError(KeycloakHTTPError):
+    pass
+
+
+class AsyncKeycloakOpenID:
+    """Klien OpenID Connect realm di atas satu `httpx.AsyncClient` (keep-alive, pooled).
+
+    Dipakai untuk jalur yang terjadi di setiap request (login, introspect, JWKS)
+    supaya round trip ke Keycloak tidak memblokir event loop.
+    """
+
+    def __init__(
+        self,
+        realm_url: str,
+        client_id: str,
+        client_secret: Optional[str],
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._http = httpx.AsyncClient(
+            base_url=f"{realm_url}/protocol/openid-connect",
+            timeout=timeout,
+            limits=limits,
+        )
+
+    def _client_auth(self) -> Dict[str, str]:
+        data = {"client_id": self.client_id}
+        if self.client_secret:
+            data["client_secret"] = self.client_secret
+        return data
+
+    async def _post_form(self, path: str, data: Dict[str, str]) -> Dict[str, Any]:
+        response = await self._http.post(path, data={**self._client_auth(), **data})
+        if response.status_code in (400, 401):
+            raise KeycloakInvalidGrantError(response.status_code, _body(response))
+        if response.is_error:
+            raise KeycloakHTTPError(response.status_code, _body(response))
+        return response.json() if response.content else {}
+
+    async def token(self, username: str, password: str) -> Dict[str, Any]:
+        return await self._post_form(
+            "/token",
+            {"grant_type": "password", "username": username, "password": password},
+        )
+
+    async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
+        return await self._post_form(
+            "/token",
+            {"grant_type": "refresh_token", "refresh_token": refresh_token},
+        )
+
+    async def logout(self, refresh_token: str) -> None:
+        await self._post_form("/logout", {"refresh_token": refresh_token})
+
+    async def introspect(self, token: str) -> Dict[str, Any]:
+        return await self._post_form("/token/introspect", {"token": token})
+
+    async def certs(self) -> Dict[str, Any]:
+        response = await self._http.get("/certs")
+        if response.is_error:
+            raise KeycloakHTTPError(response.status_code, _body(response))
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+def _body(response: httpx.Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+DEFAULT_POLICY: Dict[str, List[str]] = {
+    "admin": ["users:manage", "system:manage"],
+    "pm": ["master:read", "master:write", "activity:write", "activity:read", "activity:read_all"],
+    "dev": ["activity:write", "activity:read"],
+}
+
+# Bit per permission hanya pernah ditambah, tidak pernah diubah, supaya mask yang
+# sudah dihitung per route tetap valid setelah policy di-reload.
+_permission_bits: Dict[str, int] = {}
+_bits_lock = threading.Lock()
+
+
+def permission_bit(permission: str) -> int:
+    bit = _permission_bits.get(permission)
+    if bit is None:
+        with _bits_lock:
+            bit = _permission_bits.setdefault(permission, 1 << len(_permission_bits))
+    return bit
+
+
+def permissions_mask(permissions: Iterable[str]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= permission_bit(permission)
+    return mask
+
+
+class CompiledPolicy:
+    def __init__(self, roles: Dict[str, List[str]], version: int):
+        self.version = version
+        self.roles = {role: sorted(set(perms)) for role, perms in roles.items()}
+        self.role_masks = {role: permissions_mask(perms) for role, perms in self.roles.items()}
+
+    def mask_for_roles(self, roles: Iterable[str]) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self.role_masks.get(role, 0)
+        return mask
+
+
+_policy: Optional[CompiledPolicy] = None
+_policy_mtime: Optional[float] = None
+_checked_at = 0.0
+_reload_lock = threading.Lock()
+
+
+def _read_policy_file() -> Dict[str, List[str]]:
+    with open(settings.rbac_policy_file, encoding="utf-8") as f:
+        data = json.load(f)
+    roles = data.get("roles", data)
+    if not isinstance(roles, dict) or not all(isinstance(v, list) for v in roles.values()):
+        raise ValueError("RBAC policy must map role names to lists of permissions")
+    return roles
+
+
+def reload_policy() -> CompiledPolicy:
+    global _policy, _policy_mtime, _checked_at
+    with _reload_lock:
+        roles = DEFAULT_POLICY
+        mtime = None
+        if settings.rbac_policy_file:
+            mtime = os.path.getmtime(settings.rbac_policy_file)
+            roles = _read_policy_file()
+        version = _policy.version + 1 if _policy else 1
+        _policy = CompiledPolicy(roles, version)
+        _policy_mtime = mtime
+        _checked_at = time.monotonic()
+        return _policy
+
+
+def get_policy() -> CompiledPolicy:
+    global _checked_at
+    if _policy is None:
+        return reload_policy()
+    if settings.rbac_policy_file and time.monotonic() - _checked_at >= settings.rbac_policy_check_interval_seconds:
+        _checked_at = time.monotonic()
+        try:
+            if os.path.getmtime(settings.rbac_policy_file) != _policy_mtime:
+                return reload_policy()
+        except (OSError, ValueError):
+            pass
+    return _policy
@@ -5,6 +5,6 @@ from app.services.user.schemas.profile import UserInfo
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserInfo:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserInfo:
     token = credentials.credentials
-    return AuthService.verify_token(token)
+    return await AuthService.verify_token(token)
@@ -1,17 +1,34 @@
 from fastapi import Depends, HTTPException, status
+from app.core.policy import get_policy, permissions_mask
 from app.middlewares.auth import get_current_user
 from app.services.user.schemas.profile import UserInfo
 
 def require_roles(roles: list[str]):
+    allowed = frozenset(roles)
+
     def role_checker(current_user: UserInfo = Depends(get_current_user)):
-        print(f"[RBAC] current_user: {current_user}")  # LOG
-        user_roles = getattr(current_user, "roles", [])
-        print(f"[RBAC] user_roles: {user_roles}, required: {roles}")  # LOG
-        if not any(role in user_roles for role in roles):
-            print("[RBAC] Forbidden: user does not have required role")  # LOG
+        if allowed.isdisjoint(current_user.roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have the required role(s)"
             )
         return current_user
     return role_checker
+
+def has_permissions(current_user: UserInfo, *permissions: str) -> bool:
+    required = permissions_mask(permissions)
+    policy = get_policy()
+    mask = current_user.permission_mask
+    if current_user.policy_version != policy.version:
+        mask = policy.mask_for_roles(current_user.roles)
+    return mask & required == required
+
+def require_permissions(*permissions: str):
+    def permission_checker(current_user: UserInfo = Depends(get_current_user)):
+        if not has_permissions(current_user, *permissions):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have the required permission(s)"
+            )
+        return current_user
+    return permission_checker
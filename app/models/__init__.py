@@ -1,2 +1,6 @@
 from app.models.activity_cateories import ActivityCategories
 from app.models.performance_standards import PerformanceStandards
+from app.models.category_weights import CategoryWeights
+from app.models.activity_records import ActivityRecords
+from app.models.activity_rollups import ActivityRollups, RollupWatermarks
+from app.models.archive import ArchivedActivityCategories, ArchivedPerformanceStandards
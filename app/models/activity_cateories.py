@@ -1,8 +1,20 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Index, func, text
 from app.utils.base_model import BaseModel
 
 class ActivityCategories(BaseModel):
     __tablename__ = "ref_activity_categories"
 
-    name = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False)
     is_active = Column(Boolean, nullable=False, server_default="true")
+
+    __table_args__ = (
+        Index(
+            "uq_ref_activity_categories_name_lower",
+            func.lower(name),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_ref_activity_categories_name_id", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_ref_activity_categories_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_ref_activity_categories_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
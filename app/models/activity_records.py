@@ -0,0 +1,34 @@
+import uuid
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.core.database import Base
+
+
+class ActivityRecords(Base):
+    """Event aktivitas mentah dari klien time-tracking (append-only)."""
+
+    __tablename__ = "trx_activity_records"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    user_id = Column(String, nullable=False, comment="ID user Keycloak")
+    category_id = Column(UUID(as_uuid=True), ForeignKey("ref_activity_categories.id"), nullable=False, comment="ID Kategori Aktivitas")
+    standard_id = Column(UUID(as_uuid=True), ForeignKey("ref_performance_standards.id"), nullable=True, comment="ID Standar Kinerja")
+    event_id = Column(String(100), nullable=True, comment="ID event dari klien, untuk dedup saat retry")
+    started_at = Column(DateTime(timezone=True), nullable=False, comment="Waktu mulai aktivitas")
+    ended_at = Column(DateTime(timezone=True), nullable=True, comment="Waktu selesai aktivitas")
+    metrics = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"), comment="Nilai metric aktivitas")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "uq_trx_activity_records_user_event",
+            "user_id", "event_id",
+            unique=True,
+            postgresql_where=text("event_id IS NOT NULL"),
+        ),
+        Index("ix_trx_activity_records_user_started", "user_id", "started_at"),
+        Index("ix_trx_activity_records_category_started", "category_id", "started_at"),
+        Index("ix_trx_activity_records_created_id", "created_at", "id"),
+        Index("ix_trx_activity_records_standard", "standard_id", postgresql_where=text("standard_id IS NOT NULL")),
+    )
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Date, DateTime, Float, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class ActivityRollups(Base):
+    """Agregat aktivitas per periode (day/week/month), user, kategori dan standar.
+
+    Tanpa FK supaya tetap valid setelah master data di-purge; event tanpa
+    standar disimpan dengan `standard_id` UUID nol agar bisa jadi bagian PK.
+    """
+
+    __tablename__ = "agg_activity_rollups"
+
+    period = Column(String(5), primary_key=True, comment="day, week atau month")
+    user_id = Column(String, primary_key=True, comment="ID user Keycloak")
+    period_start = Column(Date, primary_key=True, comment="Tanggal awal periode")
+    category_id = Column(UUID(as_uuid=True), primary_key=True, comment="ID Kategori Aktivitas")
+    standard_id = Column(UUID(as_uuid=True), primary_key=True, comment="ID Standar Kinerja, UUID nol bila tanpa standar")
+    event_count = Column(Integer, nullable=False, server_default="0", comment="Jumlah event")
+    duration_seconds = Column(Float, nullable=False, server_default="0", comment="Total durasi aktivitas")
+    score_sum = Column(Float, nullable=False, server_default="0", comment="Total skor event yang dinilai sistem")
+    scored_count = Column(Integer, nullable=False, server_default="0", comment="Jumlah event yang dinilai sistem")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_agg_activity_rollups_category", "period", "category_id", "period_start"),
+    )
+
+
+class RollupWatermarks(Base):
+    """Posisi terakhir (created_at, id) yang sudah diproses job catch-up rollup."""
+
+    __tablename__ = "agg_rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_id = Column(UUID(as_uuid=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,54 @@
+from sqlalchemy import Boolean, Column, DECIMAL, DateTime, Enum, Index, Integer, JSON, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+from app.models.performance_standards import PerformanceStandardsEvaluationMethod
+
+
+class ArchiveBase(Base):
+    """Salinan baris soft-deleted yang dipindah dari tabel utama.
+
+    Tidak ada FK: standar arsip boleh menunjuk kategori yang masih di tabel
+    utama maupun yang sudah diarsip.
+    """
+
+    __abstract__ = True
+
+    id = Column(UUID(as_uuid=True), primary_key=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
+    created_by = Column(String, nullable=True)
+    updated_by = Column(String, nullable=True)
+    version = Column(Integer, nullable=False, server_default="1")
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Waktu dipindah ke arsip")
+
+
+class ArchivedActivityCategories(ArchiveBase):
+    __tablename__ = "arc_activity_categories"
+
+    name = Column(String, nullable=False)
+    is_active = Column(Boolean, nullable=False)
+
+
+class ArchivedPerformanceStandards(ArchiveBase):
+    __tablename__ = "arc_performance_standards"
+
+    category_id = Column(UUID(as_uuid=True), nullable=False, comment="ID Kategori Aktivitas")
+    name = Column(String, nullable=False, comment="Nama Standar")
+    description = Column(Text, nullable=True, comment="Deskripsi Standar")
+    evaluation_method = Column(
+        Enum(
+            PerformanceStandardsEvaluationMethod,
+            name="performancestandardsevaluationmethod",
+        ),
+        nullable=False,
+        comment="Metode Penilaian"
+    )
+    scoring_rules = Column(JSON, nullable=True, comment="Aturan Penilaian Sistem (JSON)")
+    evaluation_guide = Column(Text, nullable=True, comment="Panduan Penilaian PM")
+    weight_percentage = Column(DECIMAL(5, 2), nullable=False, comment="Bobot Persentase")
+
+    __table_args__ = (
+        Index("ix_arc_performance_standards_category_id", "category_id"),
+    )
@@ -0,0 +1,57 @@
+from sqlalchemy import Column, DDL, DECIMAL, DateTime, ForeignKey, Integer, event, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+from app.models.performance_standards import PerformanceStandards
+
+
+class CategoryWeights(Base):
+    """Total bobot dan jumlah standar hidup per kategori.
+
+    Diisi trigger pada `ref_performance_standards`, jadi selalu ikut transaksi
+    yang sama dengan insert/update/soft delete standar (termasuk import dan
+    statement set-based), tanpa perlu scan ulang.
+    """
+
+    __tablename__ = "agg_category_weights"
+
+    category_id = Column(UUID(as_uuid=True), ForeignKey("ref_activity_categories.id"), primary_key=True, comment="ID Kategori Aktivitas")
+    weight_total = Column(DECIMAL(10, 2), nullable=False, server_default="0", comment="Total bobot standar aktif")
+    standards_count = Column(Integer, nullable=False, server_default="0", comment="Jumlah standar aktif")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+APPLY_WEIGHTS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION agg_category_weights_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+        INSERT INTO agg_category_weights AS w (category_id, weight_total, standards_count)
+        VALUES (OLD.category_id, -OLD.weight_percentage, -1)
+        ON CONFLICT (category_id) DO UPDATE
+        SET weight_total = w.weight_total + EXCLUDED.weight_total,
+            standards_count = w.standards_count + EXCLUDED.standards_count,
+            updated_at = now();
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+        INSERT INTO agg_category_weights AS w (category_id, weight_total, standards_count)
+        VALUES (NEW.category_id, NEW.weight_percentage, 1)
+        ON CONFLICT (category_id) DO UPDATE
+        SET weight_total = w.weight_total + EXCLUDED.weight_total,
+            standards_count = w.standards_count + EXCLUDED.standards_count,
+            updated_at = now();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+APPLY_WEIGHTS_TRIGGER = DDL("""
+CREATE TRIGGER trg_ref_performance_standards_weights
+AFTER INSERT OR DELETE OR UPDATE OF category_id, weight_percentage, deleted_at
+ON ref_performance_standards
+FOR EACH ROW EXECUTE FUNCTION agg_category_weights_apply()
+""")
+
+# Untuk database yang dibuat lewat create_all; lingkungan lain lewat migration
+event.listen(PerformanceStandards.__table__, "after_create", APPLY_WEIGHTS_FUNCTION)
+event.listen(PerformanceStandards.__table__, "after_create", APPLY_WEIGHTS_TRIGGER)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Text, Enum, JSON, DECIMAL, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Text, Enum, JSON, DECIMAL, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 import enum
 from app.utils.base_model import BaseModel
 
@@ -25,5 +25,41 @@ class PerformanceStandards(BaseModel):
     scoring_rules = Column(JSON, nullable=True, comment="Aturan Penilaian Sistem (JSON)")
     evaluation_guide = Column(Text, nullable=True, comment="Panduan Penilaian PM")
     weight_percentage = Column(DECIMAL(5, 2), nullable=False, comment="Bobot Persentase")
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(evaluation_guide, '')), 'C')",
+            persisted=True,
+        ),
+        comment="Dokumen full-text search",
+    ))
 
     activity_category = relationship("ActivityCategories", backref="performance_standards")
+
+    __table_args__ = (
+        Index(
+            "uq_ref_performance_standards_category_name_lower",
+            category_id,
+            func.lower(name),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_ref_performance_standards_name_id", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index(
+            "ix_ref_performance_standards_category_name_id",
+            "category_id", "name", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_ref_performance_standards_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_ref_performance_standards_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        Index("ix_ref_performance_standards_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_ref_performance_standards_category_id", "category_id"),
+        Index("ix_ref_performance_standards_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
@@ -0,0 +1,82 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.middlewares.rbac import has_permissions, require_permissions
+from app.services.activity.activity_svc import ActivityService
+from app.services.activity.rollup_svc import RollupPeriod, RollupService
+from app.services.user.schemas.profile import UserInfo
+from app.utils.ndjson import iter_request_rows
+from app.utils.pagination import MAX_PAGE_LIMIT
+from app.utils.response.exception import APIException
+from app.utils.response.response import paginated_response, success_response
+
+router = APIRouter(prefix="/activity")
+
+
+@router.post(
+    "/ingest",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def ingest_activities(
+    request: Request,
+    wait: bool = Query(False, description="Respond only after the accepted events have been flushed"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("activity:write"))
+):
+    """Body berupa NDJSON atau JSON array `ActivityEventIn`; event dicatat atas nama user yang login."""
+    result = await ActivityService.ingest_activities(db, iter_request_rows(request), current_user.id, wait=wait)
+    return success_response(
+        data=result,
+        message="Activity events flushed" if wait else "Activity events accepted",
+        status_code=status.HTTP_200_OK if wait else status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.get(
+    "/rollups",
+    status_code=status.HTTP_200_OK,
+)
+async def list_activity_rollups(
+    period: RollupPeriod = Query(RollupPeriod.DAY),
+    start: date = Query(...),
+    end: date = Query(...),
+    user_id: Optional[str] = Query(None, description="Defaults to the current user"),
+    category_id: Optional[UUID] = Query(None),
+    standard_id: Optional[UUID] = Query(None),
+    page: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("activity:read"))
+):
+    if end < start:
+        raise APIException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message="end must not be earlier than start",
+        )
+    user_id = user_id or current_user.id
+    if user_id != current_user.id and not has_permissions(current_user, "activity:read_all"):
+        raise APIException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            message="You do not have the required permission(s)",
+        )
+    items = await RollupService.list_rollups(
+        db, period, start, end, user_id, category_id, standard_id, page, limit,
+    )
+    return paginated_response(
+        items=items,
+        total=None,
+        page=page,
+        limit=limit,
+        total_mode="none",
+        filters={
+            "period": period.value,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "user_id": user_id,
+            "category_id": category_id,
+            "standard_id": standard_id,
+        },
+    )
@@ -1,12 +1,24 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, Path, Query, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.middlewares.rbac import require_roles
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.models.activity_cateories import ActivityCategories
+from app.middlewares.rbac import require_permissions
 from app.services.master.activity_categories_svc import ActivityCategoriesService
-from app.services.master.schemas.activity_categories_dto import ActivityCategoriesAdd, ActivityCategoriesResponse, ActivityCategoriesUpdate
+from app.services.master.schemas.activity_categories_dto import (
+    ActivityCategoriesAdd,
+    ActivityCategoriesBatchUpdate,
+    ActivityCategoriesListItem,
+    ActivityCategoriesResponse,
+    ActivityCategoriesUpdate,
+)
+from app.services.master.schemas.batch_dto import BatchDeleteRequest
 from app.services.user.schemas.profile import UserInfo
-from app.utils.response.response import paginated_response, success_response
+from app.utils.etag import etag_matches, make_etag, parse_if_match, row_etag, table_version
+from app.utils.export import EXPORT_MEDIA_TYPES, ExportFormat, export_chunks
+from app.utils.pagination import MAX_PAGE_LIMIT, TotalMode
+from app.utils.response.response import BaseResponse, paginated_response, success_response
 
 router = APIRouter(prefix="/activity_categories")
 
@@ -14,67 +26,159 @@ router = APIRouter(prefix="/activity_categories")
 @router.post(
     "/add",
     status_code=status.HTTP_201_CREATED,
+    response_model=BaseResponse[ActivityCategoriesResponse],
 )
 async def add_activity_categories(
     payload: ActivityCategoriesAdd,
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
 ):
-    ac = ActivityCategoriesService.add_activity_categories(db, payload, current_user.id)
+    ac = await ActivityCategoriesService.add_activity_categories(db, payload, current_user.id)
     return success_response(
         data=ActivityCategoriesResponse.model_validate(ac),
         message="Activity categoreis created successfully",
         status_code=status.HTTP_201_CREATED,
+        headers={"ETag": row_etag(ac.version)},
     )
 
 
 @router.get(
     "/list",
     status_code=status.HTTP_200_OK,
+    response_model=BaseResponse[List[ActivityCategoriesListItem]],
 )
 async def list_activity_categories(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT),
     filter: str = Query(None),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
     is_active: Optional[bool] = Query(None),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor; overrides page"),
+    include_total: bool = Query(True),
+    total_mode: TotalMode = Query(TotalMode.EXACT),
+    rank: bool = Query(False, description="Order by similarity to filter instead of name"),
+    current_user: UserInfo = Depends(require_permissions("master:read"))
 ):
-    items, total = ActivityCategoriesService.list_activity_categories(
-        db, page, limit, filter, sort_order, is_active
+    version = await table_version(db, ActivityCategories)
+    etag = make_etag(version, request)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if not include_total:
+        total_mode = TotalMode.NONE
+    result = await ActivityCategoriesService.list_activity_categories_cached(
+        db, page, limit, filter, sort_order, is_active, cursor, total_mode,
+        rank=rank, version=version,
     )
     return paginated_response(
-        items=[
-            {"id": r.id, "name": r.name, "is_active": r.is_active}
-            for r in items
-        ],
-        total=total,
+        items=result.items,
+        total=result.total,
         page=page,
         limit=limit,
+        next_cursor=result.next_cursor,
+        total_mode=total_mode.value,
         filters=(
             {"filter": filter, "sort_order": sort_order, "is_active": is_active}
             if filter or is_active is not None
             else None
         ),
+        headers={"ETag": etag},
+    )
+
+
+@router.get(
+    "/summary",
+    status_code=status.HTTP_200_OK,
+)
+async def activity_categories_summary(
+    db: AsyncSession = Depends(get_async_db),
+    category_id: Optional[str] = Query(None),
+    incomplete_only: bool = Query(False, description="Only categories whose weights do not add up to 100"),
+    current_user: UserInfo = Depends(require_permissions("master:read"))
+):
+    summary = await ActivityCategoriesService.category_weight_summary(db, category_id, incomplete_only)
+    return success_response(
+        data=summary,
+        message="Activity categories summary retrieved successfully",
+    )
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+)
+async def export_activity_categories(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    is_active: Optional[bool] = Query(None),
+    current_user: UserInfo = Depends(require_permissions("master:read"))
+):
+    return StreamingResponse(
+        export_chunks(ActivityCategoriesService.export_activity_categories(is_active), format, list(ActivityCategoriesResponse.model_fields)),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="activity_categories.{format.value}"'},
+    )
+
+
+# Route batch didaftarkan sebelum /{activity_categories_id} supaya "batch" tidak dibaca sebagai id
+@router.patch(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+)
+async def update_activity_categories_batch(
+    payload: ActivityCategoriesBatchUpdate,
+    atomic: bool = Query(False, description="Apply nothing when any item is not updated"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
+):
+    result = await ActivityCategoriesService.update_activity_categories_batch(db, payload.items, current_user.id, atomic)
+    return success_response(
+        data=result,
+        message="Activity categories batch update processed",
+        status_code=status.HTTP_200_OK,
+    )
+
+
+@router.delete(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+)
+async def delete_activity_categories_batch(
+    payload: BatchDeleteRequest,
+    atomic: bool = Query(False, description="Apply nothing when any item is not deleted"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
+):
+    result = await ActivityCategoriesService.delete_activity_categories_batch(db, payload.items, current_user.id, atomic)
+    return success_response(
+        data=result,
+        message="Activity categories batch delete processed",
+        status_code=status.HTTP_200_OK,
     )
 
 
 @router.put(
     "/{activity_categories_id}",
     status_code=status.HTTP_200_OK,
+    response_model=BaseResponse[ActivityCategoriesResponse],
 )
 async def update_activity_categories(
     payload: ActivityCategoriesUpdate,
     activity_categories_id: str = Path(..., description="Activity Categories ID"),
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    if_match: Optional[str] = Header(None, description="Row version from ETag; 409 when it is stale"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
 ):
-    ac = ActivityCategoriesService.update_activity_categories(db, activity_categories_id, payload, current_user.id)
+    expected_version = parse_if_match(if_match)
+    if expected_version is None:
+        expected_version = payload.version
+    ac = await ActivityCategoriesService.update_activity_categories(db, activity_categories_id, payload, current_user.id, expected_version)
     return success_response(
         data=ActivityCategoriesResponse.model_validate(ac),
         message="Activity categories updated successfully",
         status_code=status.HTTP_200_OK,
+        headers={"ETag": row_etag(ac.version)},
     )
 
 
@@ -84,10 +188,11 @@ async def update_activity_categories(
 )
 async def delete_activity_categories(
     activity_categories_id: str = Path(..., description="Activity Categories ID"),
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    if_match: Optional[str] = Header(None, description="Row version from ETag; 409 when it is stale"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
 ):
-    ActivityCategoriesService.delete_activity_categories(db, activity_categories_id, current_user.id)
+    await ActivityCategoriesService.delete_activity_categories(db, activity_categories_id, current_user.id, parse_if_match(if_match))
     return success_response(
         message="Activity Categories deleted successfully",
         status_code=status.HTTP_200_OK,
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, status, Depends
-from app.middlewares.rbac import require_roles
+from fastapi import APIRouter, Request, status, Depends
+from app.middlewares.rbac import require_permissions
 from app.services.auth.auth import AuthService
-from app.services.auth.schemas.login import TokenRequest
+from app.services.auth.schemas.login import RefreshTokenRequest, TokenRequest
 from app.services.auth.schemas.register import RegisterRequest
 from app.services.user.schemas.profile import UserInfo
+from app.utils.ndjson import iter_request_rows
 from app.utils.response.response import success_response
 
 router = APIRouter(prefix="/auth")
@@ -13,24 +14,63 @@ router = APIRouter(prefix="/auth")
     status_code=status.HTTP_200_OK
 )
 async def login(payload: TokenRequest):
-    token = AuthService.authenticate_user(payload)
+    token = await AuthService.authenticate_user(payload)
     return success_response(
         data=token,
         message="login berhasil",
         status_code=status.HTTP_200_OK,
     )
 
+@router.post(
+    "/refresh",
+    status_code=status.HTTP_200_OK
+)
+async def refresh(payload: RefreshTokenRequest):
+    token = await AuthService.refresh_token(payload)
+    return success_response(
+        data=token,
+        message="token berhasil diperbarui",
+        status_code=status.HTTP_200_OK,
+    )
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_200_OK
+)
+async def logout(payload: RefreshTokenRequest):
+    await AuthService.logout(payload)
+    return success_response(
+        message="logout berhasil",
+        status_code=status.HTTP_200_OK,
+    )
+
 @router.post(
     "/add-user",
     status_code=status.HTTP_201_CREATED
 )
 async def register(
     payload: RegisterRequest,
-    current_user: UserInfo = Depends(require_roles(["admin"]))
+    current_user: UserInfo = Depends(require_permissions("users:manage"))
 ):
-    result = AuthService.register_user(payload)
+    result = await AuthService.register_user(payload)
     return success_response(
         data=result,
         message="berhasil menambahkan akun",
         status_code=status.HTTP_201_CREATED,
     )
+
+@router.post(
+    "/add-user/bulk",
+    status_code=status.HTTP_200_OK
+)
+async def register_bulk(
+    request: Request,
+    current_user: UserInfo = Depends(require_permissions("users:manage"))
+):
+    """Body berupa JSON array `RegisterRequest` atau stream NDJSON (`application/x-ndjson`)."""
+    result = await AuthService.register_users_bulk(iter_request_rows(request))
+    return success_response(
+        data=result,
+        message="proses tambah akun massal selesai",
+        status_code=status.HTTP_200_OK,
+    )
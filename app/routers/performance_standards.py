@@ -1,81 +1,211 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, Path, Query, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.middlewares.rbac import require_roles
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.models.performance_standards import PerformanceStandards
+from app.middlewares.rbac import require_permissions
 from app.services.master.performance_standards_dto import PerformanceStandardService
 from app.services.master.schemas.performance_standards_dto import (
     PerformanceStandardsAdd,
+    PerformanceStandardsBatchUpdate,
     PerformanceStandardsResponse,
     PerformanceStandardsUpdate,
 )
+from app.services.master.schemas.batch_dto import BatchDeleteRequest
+from app.services.scoring.schemas.scoring_dto import ScoreRequest, ScoreResponse
+from app.services.scoring.scoring_svc import ScoringService, scores_to_lists
 from app.services.user.schemas.profile import UserInfo
-from app.utils.response.response import paginated_response, success_response
+from app.utils.csv_stream import is_csv, iter_csv_records
+from app.utils.etag import etag_matches, make_etag, parse_if_match, row_etag, table_version
+from app.utils.ndjson import iter_request_rows
+from app.utils.export import EXPORT_MEDIA_TYPES, ExportFormat, export_chunks
+from app.utils.pagination import MAX_PAGE_LIMIT, TotalMode
+from app.utils.search import SearchMode
+from app.utils.response.response import BaseResponse, paginated_response, success_response
 
 router = APIRouter(prefix="/performance_standards")
 
 @router.post(
     "/add",
     status_code=status.HTTP_201_CREATED,
+    response_model=BaseResponse[PerformanceStandardsResponse],
 )
 async def add_performance_standards(
     payload: PerformanceStandardsAdd,
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
 ):
-    ps = PerformanceStandardService.add_performance_standards(db, payload, current_user.id)
+    ps = await PerformanceStandardService.add_performance_standards(db, payload, current_user.id)
     return success_response(
         data=PerformanceStandardsResponse.model_validate(ps),
         message="Performance standards created successfully",
         status_code=status.HTTP_201_CREATED,
+        headers={"ETag": row_etag(ps.version)},
     )
 
 @router.get(
     "/list",
     status_code=status.HTTP_200_OK,
+    response_model=BaseResponse[List[PerformanceStandardsResponse]],
 )
 async def list_performance_standards(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_LIMIT),
     filter: str = Query(None),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
     category_id: Optional[str] = Query(None),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor; overrides page"),
+    include_total: bool = Query(True),
+    total_mode: TotalMode = Query(TotalMode.EXACT),
+    search_mode: SearchMode = Query(SearchMode.SUBSTRING),
+    rank: bool = Query(False, description="Order by relevance to filter instead of name"),
+    current_user: UserInfo = Depends(require_permissions("master:read"))
 ):
-    items, total = PerformanceStandardService.list_performance_standards(
-        db, page, limit, filter, sort_order, category_id
+    version = await table_version(db, PerformanceStandards)
+    etag = make_etag(version, request)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if not include_total:
+        total_mode = TotalMode.NONE
+    result = await PerformanceStandardService.list_performance_standards_cached(
+        db, page, limit, filter, sort_order, category_id, cursor, total_mode,
+        search_mode=search_mode, rank=rank, version=version,
     )
     return paginated_response(
-        items=[
-            PerformanceStandardsResponse.model_validate(r)
-            for r in items
-        ],
-        total=total,
+        items=result.items,
+        total=result.total,
         page=page,
         limit=limit,
+        next_cursor=result.next_cursor,
+        total_mode=total_mode.value,
         filters=(
-            {"filter": filter, "sort_order": sort_order, "category_id": category_id}
+            {"filter": filter, "sort_order": sort_order, "category_id": category_id, "search_mode": search_mode.value}
             if filter or category_id is not None
             else None
         ),
+        headers={"ETag": etag},
+    )
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+)
+async def import_performance_standards(
+    request: Request,
+    dry_run: bool = Query(False, description="Validate only, write nothing"),
+    skip_invalid: bool = Query(False, description="Insert valid rows even when some rows fail"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
+):
+    """Body berupa CSV (`text/csv`, baris pertama header), NDJSON, atau JSON array `PerformanceStandardsAdd`."""
+    if is_csv(request.headers.get("content-type", "")):
+        rows = iter_csv_records(request.stream())
+    else:
+        rows = iter_request_rows(request)
+    result = await PerformanceStandardService.import_performance_standards(
+        db, rows, current_user.id, dry_run=dry_run, skip_invalid=skip_invalid,
+    )
+    return success_response(
+        data=result,
+        message="Performance standards import processed",
+        status_code=status.HTTP_200_OK,
+    )
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+)
+async def export_performance_standards(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    category_id: Optional[str] = Query(None),
+    current_user: UserInfo = Depends(require_permissions("master:read"))
+):
+    return StreamingResponse(
+        export_chunks(PerformanceStandardService.export_performance_standards(category_id), format, list(PerformanceStandardsResponse.model_fields)),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="performance_standards.{format.value}"'},
+    )
+
+
+@router.post(
+    "/score",
+    status_code=status.HTTP_200_OK,
+)
+async def score_performance_standards(
+    payload: ScoreRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:read"))
+):
+    scores = await ScoringService.score(db, payload.standard_ids, payload.metrics)
+    return success_response(
+        data=ScoreResponse(
+            rows=len(next(iter(payload.metrics.values()), [])),
+            scores=scores_to_lists(scores),
+        ),
+        message="Performance standards scored successfully",
+    )
+
+
+# Route batch didaftarkan sebelum /{performance_standards_id} supaya "batch" tidak dibaca sebagai id
+@router.patch(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+)
+async def update_performance_standards_batch(
+    payload: PerformanceStandardsBatchUpdate,
+    atomic: bool = Query(False, description="Apply nothing when any item is not updated"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
+):
+    result = await PerformanceStandardService.update_performance_standards_batch(db, payload.items, current_user.id, atomic)
+    return success_response(
+        data=result,
+        message="Performance standards batch update processed",
+        status_code=status.HTTP_200_OK,
+    )
+
+@router.delete(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+)
+async def delete_performance_standards_batch(
+    payload: BatchDeleteRequest,
+    atomic: bool = Query(False, description="Apply nothing when any item is not deleted"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
+):
+    result = await PerformanceStandardService.delete_performance_standards_batch(db, payload.items, current_user.id, atomic)
+    return success_response(
+        data=result,
+        message="Performance standards batch delete processed",
+        status_code=status.HTTP_200_OK,
     )
 
 @router.put(
     "/{performance_standards_id}",
     status_code=status.HTTP_200_OK,
+    response_model=BaseResponse[PerformanceStandardsResponse],
 )
 async def update_performance_standards(
     payload: PerformanceStandardsUpdate,
     performance_standards_id: str = Path(..., description="Performance Standards ID"),
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    if_match: Optional[str] = Header(None, description="Row version from ETag; 409 when it is stale"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
 ):
-    ps = PerformanceStandardService.update_performance_standards(db, performance_standards_id, payload, current_user.id)
+    expected_version = parse_if_match(if_match)
+    if expected_version is None:
+        expected_version = payload.version
+    ps = await PerformanceStandardService.update_performance_standards(db, performance_standards_id, payload, current_user.id, expected_version)
     return success_response(
         data=PerformanceStandardsResponse.model_validate(ps),
         message="Performance standards updated successfully",
         status_code=status.HTTP_200_OK,
+        headers={"ETag": row_etag(ps.version)},
     )
 
 @router.delete(
@@ -84,10 +214,11 @@ async def update_performance_standards(
 )
 async def delete_performance_standards(
     performance_standards_id: str = Path(..., description="Performance Standards ID"),
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(require_roles(["pm"]))
+    if_match: Optional[str] = Header(None, description="Row version from ETag; 409 when it is stale"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("master:write"))
 ):
-    PerformanceStandardService.delete_performance_standards(db, performance_standards_id, current_user.id)
+    await PerformanceStandardService.delete_performance_standards(db, performance_standards_id, current_user.id, parse_if_match(if_match))
     return success_response(
         message="Performance standards deleted successfully",
         status_code=status.HTTP_200_OK,
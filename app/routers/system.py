@@ -0,0 +1,204 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import async_engine, engine, get_async_db, pool_stats
+from app.core.policy import get_policy, reload_policy
+from app.middlewares.rbac import require_permissions
+from app.services.activity.ingest_buffer import activity_buffer
+from app.services.activity.rollup_svc import rollup_job
+from app.services.auth.auth import AuthService
+from app.services.master.archive_svc import ArchiveService, archive_job
+from app.services.master.list_cache import list_cache_stats
+from app.services.master.schemas.archive_dto import ArchiveRestoreRequest
+from app.services.scoring.scoring_svc import ScoringService
+from app.services.user.schemas.profile import UserInfo
+from app.utils.response.exception import APIException
+from app.utils.response.response import success_response
+
+router = APIRouter(prefix="/system")
+
+
+@router.get(
+    "/metrics/auth-cache",
+    status_code=status.HTTP_200_OK,
+)
+async def auth_cache_metrics(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    return success_response(
+        data=AuthService.token_cache_stats(),
+        message="Auth cache metrics retrieved successfully",
+    )
+
+
+@router.get(
+    "/metrics/list-cache",
+    status_code=status.HTTP_200_OK,
+)
+async def list_cache_metrics(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    return success_response(
+        data=list_cache_stats(),
+        message="List cache metrics retrieved successfully",
+    )
+
+
+@router.get(
+    "/metrics/scoring-rules",
+    status_code=status.HTTP_200_OK,
+)
+async def scoring_rule_cache_metrics(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    return success_response(
+        data=ScoringService.cache_stats(),
+        message="Scoring rule cache metrics retrieved successfully",
+    )
+
+
+@router.get(
+    "/metrics/activity-buffer",
+    status_code=status.HTTP_200_OK,
+)
+async def activity_buffer_metrics(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    return success_response(
+        data=activity_buffer.stats(),
+        message="Activity buffer metrics retrieved successfully",
+    )
+
+
+@router.get(
+    "/metrics/rollups",
+    status_code=status.HTTP_200_OK,
+)
+async def rollup_metrics(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    return success_response(
+        data=rollup_job.stats(),
+        message="Rollup metrics retrieved successfully",
+    )
+
+
+@router.post(
+    "/rollups/catch-up",
+    status_code=status.HTTP_200_OK,
+)
+async def run_rollup_catch_up(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    # Di mode inline rollup sudah diperbarui saat flush; catch-up akan menghitung ganda
+    if settings.activity_rollup_mode != "job":
+        raise APIException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message="Rollup catch-up is only available when ACTIVITY_ROLLUP_MODE=job",
+        )
+    processed = await rollup_job.run_once()
+    return success_response(
+        data={"processed_events": processed},
+        message="Rollup catch-up completed",
+    )
+
+
+@router.get(
+    "/archive/report",
+    status_code=status.HTTP_200_OK,
+)
+async def archive_report(
+    retention_days: Optional[int] = Query(None, ge=0, description="Defaults to ARCHIVE_RETENTION_DAYS"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    report = await ArchiveService.report(db, retention_days)
+    report["job"] = archive_job.stats()
+    return success_response(
+        data=report,
+        message="Archive report generated successfully",
+    )
+
+
+@router.post(
+    "/archive/run",
+    status_code=status.HTTP_200_OK,
+)
+async def run_archive(
+    retention_days: Optional[int] = Query(None, ge=0, description="Defaults to ARCHIVE_RETENTION_DAYS"),
+    dry_run: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    if dry_run:
+        result = await ArchiveService.report(db, retention_days)
+    else:
+        result = await archive_job.run_once(retention_days)
+    return success_response(
+        data=result,
+        message="Archive run completed",
+    )
+
+
+@router.post(
+    "/archive/restore",
+    status_code=status.HTTP_200_OK,
+)
+async def restore_archive(
+    payload: ArchiveRestoreRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    result = await ArchiveService.restore(db, payload.category_ids, payload.standard_ids, current_user.id)
+    return success_response(
+        data=result,
+        message="Archived rows restored successfully",
+    )
+
+
+@router.get(
+    "/metrics/db-pool",
+    status_code=status.HTTP_200_OK,
+)
+async def db_pool_metrics(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    return success_response(
+        data={"sync": pool_stats(engine.pool), "async": pool_stats(async_engine.pool)},
+        message="Database pool metrics retrieved successfully",
+    )
+
+
+@router.get(
+    "/policy",
+    status_code=status.HTTP_200_OK,
+)
+async def get_rbac_policy(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    policy = get_policy()
+    return success_response(
+        data={"version": policy.version, "roles": policy.roles},
+        message="RBAC policy retrieved successfully",
+    )
+
+
+@router.post(
+    "/policy/reload",
+    status_code=status.HTTP_200_OK,
+)
+async def reload_rbac_policy(
+    current_user: UserInfo = Depends(require_permissions("system:manage"))
+):
+    try:
+        policy = reload_policy()
+    except (OSError, ValueError) as e:
+        raise APIException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message=f"Failed to reload RBAC policy: {e}",
+        )
+    return success_response(
+        data={"version": policy.version, "roles": policy.roles},
+        message="RBAC policy reloaded successfully",
+    )
@@ -15,7 +15,7 @@ async def change_password(
     payload: ChangePasswordRequest,
     current_user: UserInfo = Depends(get_current_user),
 ):
-    result = UserService.change_password(current_user.id, payload)
+    result = await UserService.change_password(current_user.id, payload)
     return success_response(
         data=result,
         message="Password berhasil diubah",
@@ -30,7 +30,7 @@ async def update_profile(
     payload: ChangeProfileRequest,
     current_user: UserInfo = Depends(get_current_user),
 ):
-    result = UserService.update_profile(current_user.id, payload)
+    result = await UserService.update_profile(current_user.id, payload)
     return success_response(
         data=result,
         message="Profil berhasil diperbarui",
@@ -0,0 +1,142 @@
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Set, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import status
+
+from app.core.config import settings
+from app.models.activity_cateories import ActivityCategories
+from app.models.performance_standards import PerformanceStandards
+from app.services.activity.ingest_buffer import BufferFullError, activity_buffer
+from app.services.activity.schemas.activity_dto import ActivityEventIn
+from app.utils.response.exception import APIException
+
+
+class ActivityService:
+    @staticmethod
+    async def ingest_activities(
+        db: AsyncSession,
+        rows: AsyncIterator[Any],
+        user_id: str,
+        wait: bool = False,
+    ) -> Dict[str, Any]:
+        """Validasi event lalu masukkan ke buffer per potongan `activity_flush_size`,
+        sehingga stream NDJSON panjang tidak ditampung utuh di memori."""
+        known_categories: Set[UUID] = set()
+        known_standards: Dict[UUID, UUID] = {}
+        chunk: List[Tuple[int, ActivityEventIn]] = []
+        errors: List[Dict[str, Any]] = []
+        total_rows = 0
+        accepted = 0
+        # Range seq (awal, akhir] milik request ini di buffer, untuk wait_flushed
+        seq_ranges: List[Tuple[int, int]] = []
+
+        async def enqueue() -> None:
+            nonlocal accepted
+            records = await ActivityService._resolve_chunk(db, chunk, user_id, known_categories, known_standards, errors)
+            chunk.clear()
+            # Akhiri transaksi baca supaya koneksi kembali ke pool selama upload, put_many
+            # dan wait_flushed; worker flush butuh koneksi dari pool yang sama
+            await db.rollback()
+            if not records:
+                return
+            try:
+                seq = await activity_buffer.put_many(records)
+            except BufferFullError:
+                raise APIException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    message="Activity ingestion is overloaded, retry later",
+                    details={"accepted": accepted, "invalid_rows": len(errors)},
+                )
+            seq_ranges.append((seq - len(records), seq))
+            accepted += len(records)
+
+        async for row in rows:
+            total_rows += 1
+            if total_rows > settings.activity_ingest_max_events:
+                raise APIException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    message=f"Ingestion is limited to {settings.activity_ingest_max_events} events per request",
+                    details={"accepted": accepted},
+                )
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                chunk.append((total_rows, ActivityEventIn.model_validate(row)))
+            except ValidationError as e:
+                errors.append({
+                    "row": total_rows,
+                    "errors": [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()],
+                })
+            except ValueError as e:
+                errors.append({"row": total_rows, "errors": [f"invalid row: {e}"]})
+            if len(chunk) >= settings.activity_flush_size:
+                await enqueue()
+        if chunk:
+            await enqueue()
+
+        if wait and seq_ranges:
+            dropped = await activity_buffer.wait_flushed(seq_ranges)
+            if dropped:
+                raise APIException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    message="Some accepted activity events could not be written, retry with the same event_id",
+                    details={"accepted": accepted, "dropped": dropped, "invalid_rows": len(errors)},
+                )
+        return {
+            "total_rows": total_rows,
+            "accepted": accepted,
+            "invalid_rows": len(errors),
+            "flushed": wait,
+            "errors": errors,
+        }
+
+    @staticmethod
+    async def _resolve_chunk(
+        db: AsyncSession,
+        chunk: List[Tuple[int, ActivityEventIn]],
+        user_id: str,
+        known_categories: Set[UUID],
+        known_standards: Dict[UUID, UUID],
+        errors: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        # Satu query per potongan untuk kategori/standar yang belum pernah terlihat di request ini
+        new_categories = {event.category_id for _, event in chunk} - known_categories
+        if new_categories:
+            known_categories.update((await db.scalars(
+                select(ActivityCategories.id).where(
+                    ActivityCategories.id.in_(list(new_categories)),
+                    ActivityCategories.deleted_at.is_(None),
+                )
+            )).all())
+        new_standards = {event.standard_id for _, event in chunk if event.standard_id} - known_standards.keys()
+        if new_standards:
+            known_standards.update((await db.execute(
+                select(PerformanceStandards.id, PerformanceStandards.category_id).where(
+                    PerformanceStandards.id.in_(list(new_standards)),
+                    PerformanceStandards.deleted_at.is_(None),
+                )
+            )).all())
+
+        records: List[Dict[str, Any]] = []
+        for row_number, event in chunk:
+            if event.category_id not in known_categories:
+                errors.append({"row": row_number, "errors": ["category_id: Activity category not found"]})
+                continue
+            if event.standard_id and known_standards.get(event.standard_id) != event.category_id:
+                errors.append({"row": row_number, "errors": ["standard_id: Performance standard not found in this category"]})
+                continue
+            records.append({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "category_id": event.category_id,
+                "standard_id": event.standard_id,
+                "event_id": event.event_id,
+                "started_at": event.started_at,
+                "ended_at": event.ended_at,
+                "metrics": event.metrics,
+            })
+        return records
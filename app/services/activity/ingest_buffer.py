@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.activity_records import ActivityRecords
+from app.services.activity.rollup_svc import RollupService
+
+logger = logging.getLogger(__name__)
+
+FLUSH_ATTEMPTS = 3
+# Error yang disebabkan isi baris: retry tidak menolong, jadi batch ditulis per baris
+ROW_ERRORS = (IntegrityError, DataError)
+# Jumlah range seq gagal yang disimpan untuk dilaporkan ke pemanggil `wait_flushed`
+DROPPED_RANGES_KEPT = 1024
+
+# Multi-row INSERT (insertmanyvalues) dan bukan COPY, karena retry dari klien
+# dengan event_id yang sama harus di-skip lewat ON CONFLICT
+_insert_records = insert(ActivityRecords).on_conflict_do_nothing(
+    index_elements=[ActivityRecords.user_id, ActivityRecords.event_id],
+    index_where=ActivityRecords.event_id.isnot(None),
+)
+
+
+class BufferFullError(Exception):
+    pass
+
+
+def _dropped_ranges(start: int, positions: Sequence[int]) -> List[Tuple[int, int]]:
+    """Posisi event gagal di batch menjadi range seq (awal, akhir] yang digabung bila berurutan."""
+    ranges: List[Tuple[int, int]] = []
+    for position in positions:
+        seq = start + position
+        if ranges and ranges[-1][1] == seq:
+            ranges[-1] = (ranges[-1][0], seq + 1)
+        else:
+            ranges.append((seq, seq + 1))
+    return ranges
+
+
+async def write_activity_batch(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    if settings.activity_rollup_mode != "inline":
+        await db.execute(_insert_records, rows)
+        return
+    # Hanya baris yang benar-benar masuk (bukan duplikat event_id) yang dihitung ke rollup
+    inserted = set((await db.execute(_insert_records.returning(ActivityRecords.id), rows)).scalars().all())
+    await RollupService.apply(db, [row for row in rows if row["id"] in inserted])
+
+
+class ActivityIngestBuffer:
+    """Antrian event aktivitas in-memory yang di-flush ke database per batch.
+
+    Flush terjadi saat isi antrian mencapai `flush_size` atau setelah
+    `flush_interval` detik. Kalau antrian penuh, `put_many` menunggu sampai ada
+    ruang (backpressure) dan menyerah dengan `BufferFullError` setelah
+    `enqueue_timeout` detik. Event yang belum di-flush hilang kalau proses mati
+    mendadak; klien yang butuh kepastian bisa menunggu `wait_flushed`.
+    """
+
+    def __init__(self, max_events: int, flush_size: int, flush_interval: float, enqueue_timeout: float):
+        self.max_events = max_events
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._cond = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Nomor urut event terakhir yang masuk dan yang sudah diproses flush (FIFO)
+        self._enqueued_seq = 0
+        self._flushed_seq = 0
+        self._dropped: Deque[Tuple[int, int]] = deque(maxlen=DROPPED_RANGES_KEPT)
+        self.flushes = 0
+        self.flushed_events = 0
+        self.failed_flushes = 0
+        self.dropped_events = 0
+        self.rejected_events = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush sisa antrian lalu hentikan worker."""
+        async with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def put_many(self, events: List[Dict[str, Any]]) -> int:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.enqueue_timeout
+        async with self._cond:
+            while len(self._events) and len(self._events) + len(events) > self.max_events:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.rejected_events += len(events)
+                    raise BufferFullError()
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._events.extend(events)
+            self._enqueued_seq += len(events)
+            if len(self._events) >= self.flush_size:
+                self._cond.notify_all()
+            return self._enqueued_seq
+
+    async def wait_flushed(self, ranges: Sequence[Tuple[int, int]]) -> int:
+        """Tunggu sampai range seq (awal, akhir] dari `put_many` selesai di-flush.
+
+        Hasilnya jumlah event di range tersebut yang gagal ditulis.
+        """
+        if not ranges:
+            return 0
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._flushed_seq >= max(end for _, end in ranges))
+            return sum(
+                max(0, min(end, dropped_end) - max(start, dropped_start))
+                for start, end in ranges
+                for dropped_start, dropped_end in self._dropped
+            )
+
+    async def _run(self) -> None:
+        while True:
+            async with self._cond:
+                try:
+                    await asyncio.wait_for(
+                        self._cond.wait_for(lambda: len(self._events) >= self.flush_size or self._closing),
+                        self.flush_interval,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                if not self._events:
+                    if self._closing:
+                        return
+                    continue
+                batch = [self._events.popleft() for _ in range(min(len(self._events), self.flush_size))]
+                self._cond.notify_all()
+            dropped = await self._flush(batch)
+            async with self._cond:
+                self._dropped.extend(_dropped_ranges(self._flushed_seq, dropped))
+                self._flushed_seq += len(batch)
+                self._cond.notify_all()
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> List[int]:
+        """Tulis batch; hasilnya posisi event di batch yang gagal ditulis."""
+        for attempt in range(1, FLUSH_ATTEMPTS + 1):
+            try:
+                async with AsyncSessionLocal() as db:
+                    await write_activity_batch(db, batch)
+                    await db.commit()
+                self.flushes += 1
+                self.flushed_events += len(batch)
+                return []
+            except ROW_ERRORS:
+                # Satu baris rusak (mis. kategori sudah di-purge) jangan menggagalkan seluruh batch
+                return await self._flush_rows(batch)
+            except Exception:
+                self.failed_flushes += 1
+                logger.exception("Activity flush failed (attempt %s/%s, %s events)", attempt, FLUSH_ATTEMPTS, len(batch))
+                if attempt < FLUSH_ATTEMPTS:
+                    await asyncio.sleep(0.5 * attempt)
+        self.dropped_events += len(batch)
+        return list(range(len(batch)))
+
+    async def _flush_rows(self, batch: List[Dict[str, Any]]) -> List[int]:
+        dropped: List[int] = []
+        try:
+            async with AsyncSessionLocal() as db:
+                for position, row in enumerate(batch):
+                    try:
+                        async with db.begin_nested():
+                            await write_activity_batch(db, [row])
+                    except ROW_ERRORS:
+                        dropped.append(position)
+                await db.commit()
+        except Exception:
+            self.failed_flushes += 1
+            self.dropped_events += len(batch)
+            logger.exception("Activity row-by-row flush failed (%s events)", len(batch))
+            return list(range(len(batch)))
+        self.flushes += 1
+        self.flushed_events += len(batch) - len(dropped)
+        self.dropped_events += len(dropped)
+        if dropped:
+            logger.warning("Activity flush skipped %s invalid events", len(dropped))
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "buffered": len(self._events),
+            "max_events": self.max_events,
+            "flush_size": self.flush_size,
+            "flush_interval_seconds": self.flush_interval,
+            "flushes": self.flushes,
+            "flushed_events": self.flushed_events,
+            "failed_flushes": self.failed_flushes,
+            "dropped_events": self.dropped_events,
+            "rejected_events": self.rejected_events,
+        }
+
+
+activity_buffer = ActivityIngestBuffer(
+    max_events=settings.activity_buffer_max_events,
+    flush_size=settings.activity_flush_size,
+    flush_interval=settings.activity_flush_interval_seconds,
+    enqueue_timeout=settings.activity_enqueue_timeout_seconds,
+)
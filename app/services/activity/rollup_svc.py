@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.activity_records import ActivityRecords
+from app.models.activity_rollups import ActivityRollups, RollupWatermarks
+from app.services.activity.schemas.activity_dto import ActivityRollupResponse
+from app.services.scoring.scoring_svc import ScoringService
+
+logger = logging.getLogger(__name__)
+
+NO_STANDARD = uuid.UUID(int=0)
+WATERMARK_NAME = "activity_rollups"
+# Kunci advisory supaya hanya satu job catch-up yang jalan di seluruh proses
+CATCH_UP_LOCK_KEY = 720021
+
+_tz = ZoneInfo(settings.activity_rollup_timezone)
+
+_insert_rollups = insert(ActivityRollups)
+_upsert_rollups = _insert_rollups.on_conflict_do_update(
+    index_elements=[
+        ActivityRollups.period,
+        ActivityRollups.user_id,
+        ActivityRollups.period_start,
+        ActivityRollups.category_id,
+        ActivityRollups.standard_id,
+    ],
+    set_={
+        "event_count": ActivityRollups.event_count + _insert_rollups.excluded.event_count,
+        "duration_seconds": ActivityRollups.duration_seconds + _insert_rollups.excluded.duration_seconds,
+        "score_sum": ActivityRollups.score_sum + _insert_rollups.excluded.score_sum,
+        "scored_count": ActivityRollups.scored_count + _insert_rollups.excluded.scored_count,
+        "updated_at": func.now(),
+    },
+)
+
+
+class RollupPeriod(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+def period_starts(ts: datetime) -> Dict[RollupPeriod, date]:
+    day = ts.astimezone(_tz).date()
+    return {
+        RollupPeriod.DAY: day,
+        RollupPeriod.WEEK: day - timedelta(days=day.weekday()),
+        RollupPeriod.MONTH: day.replace(day=1),
+    }
+
+
+def period_start(period: RollupPeriod, day: date) -> date:
+    if period == RollupPeriod.WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == RollupPeriod.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+class RollupService:
+    @staticmethod
+    async def apply(db: AsyncSession, records: List[Dict[str, Any]]) -> None:
+        """Tambahkan event ke rollup dalam transaksi `db` yang sedang berjalan."""
+        if not records:
+            return
+        scores = await RollupService._score(db, records)
+        totals: Dict[Tuple, List[float]] = defaultdict(lambda: [0, 0.0, 0.0, 0])
+        for record, score in zip(records, scores):
+            ended_at = record["ended_at"]
+            duration = (ended_at - record["started_at"]).total_seconds() if ended_at else 0.0
+            for period, start in period_starts(record["started_at"]).items():
+                total = totals[(period.value, record["user_id"], start, record["category_id"], record["standard_id"] or NO_STANDARD)]
+                total[0] += 1
+                total[1] += duration
+                if score is not None:
+                    total[2] += score
+                    total[3] += 1
+        # Urutan key yang sama di setiap writer mencegah deadlock antar flush
+        rows = [
+            {
+                "period": key[0],
+                "user_id": key[1],
+                "period_start": key[2],
+                "category_id": key[3],
+                "standard_id": key[4],
+                "event_count": total[0],
+                "duration_seconds": total[1],
+                "score_sum": total[2],
+                "scored_count": total[3],
+            }
+            for key, total in sorted(totals.items(), key=lambda item: (item[0][0], item[0][1], item[0][2], str(item[0][3]), str(item[0][4])))
+        ]
+        await db.execute(_upsert_rollups, rows)
+
+    @staticmethod
+    async def _score(db: AsyncSession, records: List[Dict[str, Any]]) -> List[Optional[float]]:
+        scores: List[Optional[float]] = [None] * len(records)
+        by_standard: Dict[UUID, List[int]] = defaultdict(list)
+        for i, record in enumerate(records):
+            if record["standard_id"]:
+                by_standard[record["standard_id"]].append(i)
+        if not by_standard:
+            return scores
+        rules = await ScoringService.compiled_rules(db, list(by_standard), strict=False)
+        for standard_id, rule in rules.items():
+            indexes = by_standard[standard_id]
+            columns = {
+                metric: np.array([records[i]["metrics"].get(metric, np.nan) for i in indexes], dtype=np.float64)
+                for metric in rule.metrics
+            }
+            for i, value in zip(indexes, rule(columns).tolist()):
+                scores[i] = value
+        return scores
+
+    @staticmethod
+    async def catch_up(batch_size: Optional[int] = None) -> int:
+        """Proses event setelah watermark per batch; tiap batch satu transaksi bersama watermark-nya.
+
+        Event yang lebih muda dari `activity_rollup_lag_seconds` ditunda, karena
+        transaksi yang commit belakangan bisa membawa `created_at` yang lebih lama.
+        """
+        batch_size = batch_size or settings.activity_rollup_batch_size
+        processed = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                if not await db.scalar(select(func.pg_try_advisory_xact_lock(CATCH_UP_LOCK_KEY))):
+                    return processed
+                watermark = await db.get(RollupWatermarks, WATERMARK_NAME)
+                cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.activity_rollup_lag_seconds)
+                query = select(
+                    ActivityRecords.id,
+                    ActivityRecords.created_at,
+                    ActivityRecords.user_id,
+                    ActivityRecords.category_id,
+                    ActivityRecords.standard_id,
+                    ActivityRecords.started_at,
+                    ActivityRecords.ended_at,
+                    ActivityRecords.metrics,
+                ).where(ActivityRecords.created_at < cutoff)
+                if watermark:
+                    query = query.where(
+                        tuple_(ActivityRecords.created_at, ActivityRecords.id)
+                        > tuple_(watermark.last_created_at, watermark.last_id)
+                    )
+                records = [
+                    dict(row._mapping)
+                    for row in (await db.execute(
+                        query.order_by(ActivityRecords.created_at, ActivityRecords.id).limit(batch_size)
+                    )).all()
+                ]
+                if not records:
+                    return processed
+                await RollupService.apply(db, records)
+                last = records[-1]
+                if watermark is None:
+                    watermark = RollupWatermarks(name=WATERMARK_NAME)
+                    db.add(watermark)
+                watermark.last_created_at = last["created_at"]
+                watermark.last_id = last["id"]
+                await db.commit()
+            processed += len(records)
+            if len(records) < batch_size:
+                return processed
+
+    @staticmethod
+    async def list_rollups(
+        db: AsyncSession,
+        period: RollupPeriod,
+        start: date,
+        end: date,
+        user_id: Optional[str] = None,
+        category_id: Optional[UUID] = None,
+        standard_id: Optional[UUID] = None,
+        page: int = 1,
+        limit: int = 100,
+    ) -> List[ActivityRollupResponse]:
+        query = select(ActivityRollups).where(
+            ActivityRollups.period == period.value,
+            ActivityRollups.period_start >= period_start(period, start),
+            ActivityRollups.period_start <= end,
+        )
+        if user_id:
+            query = query.where(ActivityRollups.user_id == user_id)
+        if category_id:
+            query = query.where(ActivityRollups.category_id == category_id)
+        if standard_id:
+            query = query.where(ActivityRollups.standard_id == standard_id)
+        query = query.order_by(
+            ActivityRollups.period_start,
+            ActivityRollups.user_id,
+            ActivityRollups.category_id,
+            ActivityRollups.standard_id,
+        ).offset((page - 1) * limit).limit(limit)
+        return [
+            ActivityRollupResponse(
+                period=r.period,
+                period_start=r.period_start,
+                user_id=r.user_id,
+                category_id=r.category_id,
+                standard_id=None if r.standard_id == NO_STANDARD else r.standard_id,
+                event_count=r.event_count,
+                duration_seconds=r.duration_seconds,
+                score_sum=r.score_sum,
+                scored_count=r.scored_count,
+                average_score=r.score_sum / r.scored_count if r.scored_count else None,
+            )
+            for r in (await db.scalars(query)).all()
+        ]
+
+
+class RollupCatchUpJob:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.runs = 0
+        self.processed_events = 0
+        self.failed_runs = 0
+        self.last_run_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def run_once(self) -> int:
+        try:
+            processed = await RollupService.catch_up()
+        except Exception:
+            self.failed_runs += 1
+            raise
+        self.runs += 1
+        self.processed_events += processed
+        self.last_run_at = datetime.now(timezone.utc)
+        return processed
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Activity rollup catch-up failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": settings.activity_rollup_mode,
+            "running": self._task is not None and not self._task.done(),
+            "runs": self.runs,
+            "processed_events": self.processed_events,
+            "failed_runs": self.failed_runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+rollup_job = RollupCatchUpJob(interval=settings.activity_rollup_interval_seconds)
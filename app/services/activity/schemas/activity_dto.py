@@ -0,0 +1,43 @@
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field, FiniteFloat, field_validator, model_validator
+
+
+class ActivityEventIn(BaseModel):
+    category_id: UUID = Field(..., example="59e89eac-b42e-4a19-b220-a7dad5fc3dc9")
+    standard_id: Optional[UUID] = Field(None, example="0f3f0a4e-2d1b-4c8e-9a51-3f1d2e6b7c90")
+    event_id: Optional[str] = Field(None, min_length=1, max_length=100, example="client-42-000001")
+    started_at: datetime = Field(..., example="2025-10-23T09:00:00+07:00")
+    ended_at: Optional[datetime] = Field(None, example="2025-10-23T10:30:00+07:00")
+    # NaN/Infinity lolos json.loads tetapi ditolak Postgres sebagai JSON
+    metrics: Dict[str, FiniteFloat] = Field(default_factory=dict, example={"tasks_done": 3, "hours": 1.5})
+
+    @field_validator("started_at", "ended_at")
+    @classmethod
+    def _assume_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Waktu tanpa zona dianggap UTC supaya pembagian periode rollup konsisten
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @model_validator(mode="after")
+    def _check_period(self) -> "ActivityEventIn":
+        if self.ended_at is not None and self.ended_at < self.started_at:
+            raise ValueError("ended_at must not be earlier than started_at")
+        return self
+
+
+class ActivityRollupResponse(BaseModel):
+    period: str
+    period_start: date
+    user_id: str
+    category_id: UUID
+    standard_id: Optional[UUID]
+    event_count: int
+    duration_seconds: float
+    score_sum: float
+    scored_count: int
+    average_score: Optional[float]
+
+    model_config = {"from_attributes": True}
@@ -1,129 +1,232 @@
+import asyncio
+import hashlib
 import traceback
 
-from typing import Any, Dict
+import httpx
+
+from typing import Any, AsyncIterator, Dict
 
 from fastapi import status
 from jose import jwt
-from keycloak import KeycloakAdmin, KeycloakPostError
-from keycloak.exceptions import KeycloakAuthenticationError
+from keycloak import KeycloakPostError
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from app.core.clients import get_keycloak_openid
+from app.core.clients import call_keycloak_admin, get_async_keycloak, get_issuer, get_jwks_cache
+from app.core.policy import get_policy
+from app.core.keycloak_async import KeycloakHTTPError, KeycloakInvalidGrantError
 from app.core.config import settings
-from app.core.clients import get_keycloak_openid, get_keycloak_admin
-from app.services.auth.schemas.login import TokenRequest, TokenResponse
+from app.services.auth.schemas.login import RefreshTokenRequest, TokenRequest, TokenResponse
 from app.services.user.schemas.profile import UserInfo
-from app.services.auth.schemas.register import RegisterRequest
+from app.services.auth.schemas.register import BulkUserStatus, RegisterRequest
+from app.utils.cache import TTLCache
 from app.utils.response.exception import APIException
 
-# ISSUER = f"{settings.keycloak_server_url}realms/{settings.keycloak_realm}"
-# AUDIENCE = settings.keycloak_client_id
+ALLOWED_ALGORITHMS = {"RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512"}
+
+# sha256(token) -> UserInfo, berlaku sampai `exp` token atau TTL (mana yang lebih dulu)
+_token_cache: TTLCache[str, UserInfo] = TTLCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.token_cache_ttl_seconds,
+)
 
 class AuthService:
     @staticmethod
-    def authenticate_user(payload: TokenRequest) -> TokenResponse:
+    async def authenticate_user(payload: TokenRequest) -> TokenResponse:
         try:
-            keycloak_openid = get_keycloak_openid()
-            token = keycloak_openid.token(payload.username, payload.password)
-            return TokenResponse(
-                access_token=token["access_token"],
-                token_type="bearer",
-            )
-        except KeycloakAuthenticationError:
+            token = await get_async_keycloak().token(payload.username, payload.password)
+            return AuthService._token_response(token)
+        except KeycloakInvalidGrantError:
             raise APIException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="Invalid username or password",
             )
+        except (KeycloakHTTPError, httpx.HTTPError) as e:
+            raise APIException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                message=f"Keycloak tidak dapat dihubungi: {e}",
+            )
+
+    @staticmethod
+    async def refresh_token(payload: RefreshTokenRequest) -> TokenResponse:
+        try:
+            token = await get_async_keycloak().refresh_token(payload.refresh_token)
+            return AuthService._token_response(token)
+        except KeycloakInvalidGrantError:
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Refresh token tidak valid atau sudah kedaluwarsa",
+            )
+        except (KeycloakHTTPError, httpx.HTTPError) as e:
+            raise APIException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                message=f"Keycloak tidak dapat dihubungi: {e}",
+            )
+
+    @staticmethod
+    async def logout(payload: RefreshTokenRequest) -> None:
+        try:
+            await get_async_keycloak().logout(payload.refresh_token)
+        except KeycloakInvalidGrantError:
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Refresh token tidak valid atau sudah kedaluwarsa",
+            )
+        except (KeycloakHTTPError, httpx.HTTPError) as e:
+            raise APIException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                message=f"Keycloak tidak dapat dihubungi: {e}",
+            )
+
+    @staticmethod
+    def _token_response(token: Dict[str, Any]) -> TokenResponse:
+        return TokenResponse(
+            access_token=token["access_token"],
+            token_type="bearer",
+            expires_in=token.get("expires_in"),
+            refresh_token=token.get("refresh_token"),
+            refresh_expires_in=token.get("refresh_expires_in"),
+        )
 
     @staticmethod
-    def verify_token(token: str) -> UserInfo:
+    async def verify_token(token: str) -> UserInfo:
         if not token:
             raise APIException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="Token tidak diberikan"
             )
 
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            keycloak_openid = get_keycloak_openid()
+            if settings.keycloak_token_verification == "introspect":
+                claims = await AuthService._introspect_claims(token)
+            else:
+                claims = await AuthService._verify_claims_locally(token)
+            user = AuthService._build_user_info(claims)
+            _token_cache.set(cache_key, user, expires_at=claims.get("exp"))
+            return user
 
-            try:
-                token_info = keycloak_openid.introspect(token)
+        except APIException:
+            raise
+
+        except jwt.ExpiredSignatureError:
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Token sudah kedaluwarsa"
+            )
 
-                if not token_info.get('active', False):
-                    raise APIException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        message="Token tidak aktif"
-                    )
-            except Exception as introspect_error:
-                print(f"Error pada introspect token: {introspect_error}")
-                pass
+        except jwt.JWTError as jwt_error:
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message=f"Format token tidak valid: {str(jwt_error)}"
+            )
 
-            try:
-                claims = jwt.decode(
-                    token,
-                    key=None,
-                    options={
-                        "verify_signature": False,
-                        "verify_aud": False,
-                        "verify_exp": False,
-                        "verify_nbf": False,
-                        "verify_iat": False,
-                        "verify_iss": False
-                    }
-                )
+        except Exception as e:
+            print(f"Unexpected error in verify_token: {e}")
+            print(traceback.format_exc())
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message=f"Token tidak valid: {str(e)}"
+            )
+
+    @staticmethod
+    def token_cache_stats() -> Dict[str, Any]:
+        return _token_cache.stats()
 
-                print(f"Token claims: {claims.keys()}")
+    @staticmethod
+    async def _verify_claims_locally(token: str) -> Dict[str, Any]:
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm not in ALLOWED_ALGORITHMS:
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Algoritma token tidak didukung"
+            )
 
-                realm_access = claims.get("realm_access") or {}
-                realm_roles = realm_access.get("roles") or []
+        key = await get_jwks_cache().get_key(header.get("kid"))
+        if key is None:
+            raise APIException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Kunci token tidak dikenal"
+            )
 
-                resource_access = claims.get("resource_access") or {}
-                client_resource = resource_access.get(settings.keycloak_client_id) or {}
-                client_roles = client_resource.get("roles") or []
+        audience = settings.keycloak_audience or None
+        return jwt.decode(
+            token,
+            key=key,
+            algorithms=[key.get("alg", algorithm)],
+            audience=audience,
+            issuer=get_issuer(),
+            options={"verify_aud": audience is not None},
+        )
 
-                roles = list(set(realm_roles) | set(client_roles))
+    @staticmethod
+    async def _introspect_claims(token: str) -> Dict[str, Any]:
+        try:
+            token_info = await get_async_keycloak().introspect(token)
 
-                return UserInfo(
-                    id=claims.get("sub"),
-                    preferred_username=claims.get("preferred_username"),
-                    email=claims.get("email"),
-                    full_name=claims.get("name") or claims.get("given_name"),
-                    roles=roles,
-                )
-            except jwt.JWTError as jwt_error:
-                print(f"JWT decode error: {jwt_error}")
+            if not token_info.get('active', False):
                 raise APIException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    message=f"Format token tidak valid: {str(jwt_error)}"
+                    message="Token tidak aktif"
                 )
-
         except APIException:
             raise
+        except Exception as introspect_error:
+            print(f"Error pada introspect token: {introspect_error}")
 
-        except Exception as e:
-            print(f"Unexpected error in verify_token: {e}")
-            print(traceback.format_exc())
-            raise APIException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                message=f"Token tidak valid: {str(e)}"
-            )
+        return jwt.get_unverified_claims(token)
+
+    @staticmethod
+    def _build_user_info(claims: Dict[str, Any]) -> UserInfo:
+        realm_access = claims.get("realm_access") or {}
+        realm_roles = realm_access.get("roles") or []
+
+        resource_access = claims.get("resource_access") or {}
+        client_resource = resource_access.get(settings.keycloak_client_id) or {}
+        client_roles = client_resource.get("roles") or []
+
+        roles = list(set(realm_roles) | set(client_roles))
+        policy = get_policy()
+
+        return UserInfo(
+            id=claims.get("sub"),
+            preferred_username=claims.get("preferred_username"),
+            email=claims.get("email"),
+            full_name=claims.get("name") or claims.get("given_name"),
+            roles=roles,
+            permission_mask=policy.mask_for_roles(roles),
+            policy_version=policy.version,
+        )
+
+    @staticmethod
+    def _create_user(payload: RegisterRequest) -> str:
+        return call_keycloak_admin(lambda admin: admin.create_user({
+            "username": payload.username,
+            "email": payload.email,
+            "firstName": payload.first_name,
+            "lastName": payload.last_name,
+            "enabled": True,
+            "emailVerified": False,
+            "credentials": [{
+                "type": "password",
+                "value": payload.password,
+                "temporary": False,
+            }],
+        }))
 
     @staticmethod
-    def register_user(payload: RegisterRequest) -> Dict[str, Any]:
-        keycloak_admin = get_keycloak_admin()
+    def _is_user_exists_error(error: KeycloakPostError) -> bool:
+        return getattr(error, "response_code", None) == 409 or "User exists" in str(error)
+
+    @staticmethod
+    async def register_user(payload: RegisterRequest) -> Dict[str, Any]:
         try:
-            user_id = keycloak_admin.create_user({
-                "username": payload.username,
-                "email": payload.email,
-                "firstName": payload.first_name,
-                "lastName": payload.last_name,
-                "enabled": True,
-                "emailVerified": False,
-                "credentials": [{
-                    "type": "password",
-                    "value": payload.password,
-                    "temporary": False,
-                }],
-            })
+            user_id = await run_in_threadpool(AuthService._create_user, payload)
 
             return {
                 "message": "User registered successfully",
@@ -134,10 +237,56 @@ class AuthService:
         except KeycloakPostError as e:
             print("🔑 Keycloak Error:", e)
             error_msg = str(e)
-            if "User exists" in error_msg:
+            if AuthService._is_user_exists_error(e):
                 raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Username or email already exists")
             raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message=f"Registration failed: {error_msg}")
 
         except Exception as e:
             print("💥 Unexpected Error:", e)
             raise APIException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, message=f"Internal error: {str(e)}")
+
+    @staticmethod
+    async def register_users_bulk(rows: AsyncIterator[Any]) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(settings.user_bulk_concurrency)
+
+        async def provision(index: int, row: Any) -> Dict[str, Any]:
+            result: Dict[str, Any] = {"row": index}
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                payload = RegisterRequest.model_validate(row)
+                result["username"] = payload.username
+                result["user_id"] = await run_in_threadpool(AuthService._create_user, payload)
+                result["status"] = BulkUserStatus.CREATED
+            except ValidationError as e:
+                result["status"] = BulkUserStatus.FAILED
+                result["error"] = "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+            except KeycloakPostError as e:
+                if AuthService._is_user_exists_error(e):
+                    result["status"] = BulkUserStatus.EXISTS
+                else:
+                    result["status"] = BulkUserStatus.FAILED
+                    result["error"] = str(e)
+            except Exception as e:
+                result["status"] = BulkUserStatus.FAILED
+                result["error"] = str(e)
+            finally:
+                semaphore.release()
+            return result
+
+        tasks = []
+        truncated = False
+        async for row in rows:
+            if len(tasks) >= settings.user_bulk_max_rows:
+                truncated = True
+                break
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(provision(len(tasks) + 1, row)))
+
+        results = await asyncio.gather(*tasks)
+        summary = {"total": len(results), "truncated": truncated}
+        for item in BulkUserStatus:
+            summary[item.value] = sum(1 for r in results if r["status"] == item)
+        return {"summary": summary, "results": results}
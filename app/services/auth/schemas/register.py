@@ -1,3 +1,4 @@
+from enum import Enum
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
@@ -11,3 +12,8 @@ class RegisterRequest(BaseModel):
 class RegisterResponse(BaseModel):
     message: str
     username: str
+
+class BulkUserStatus(str, Enum):
+    CREATED = "created"
+    EXISTS = "exists"
+    FAILED = "failed"
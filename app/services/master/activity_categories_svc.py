@@ -1,103 +1,339 @@
-from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import Boolean, String, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import status
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.models.activity_cateories import ActivityCategories
-from app.services.master.schemas.activity_categories_dto import ActivityCategoriesAdd, ActivityCategoriesUpdate
+from app.models.category_weights import CategoryWeights
+from app.services.master.batch import (
+    batch_rejected,
+    batch_response,
+    batch_values,
+    changed_values,
+    check_batch,
+    classify_missing,
+    target_rows,
+)
+from app.services.master.list_cache import ListPage, activity_categories_cache
+from app.services.master.schemas.activity_categories_dto import (
+    ActivityCategoriesAdd,
+    ActivityCategoriesBatchUpdateItem,
+    ActivityCategoriesListItem,
+    ActivityCategoriesResponse,
+    ActivityCategoriesUpdate,
+    CategoryWeightSummary,
+)
+from app.services.master.schemas.batch_dto import BatchDeleteItem, BatchItemResult, BatchItemStatus
 
+from app.utils.db_errors import is_unique_violation
+from app.utils.etag import invalidate_table_version
+from app.utils.pagination import TotalMode, fetch_page, invalidate_counts, keyset_next_cursor, keyset_page
 from app.utils.response.exception import APIException
 
+NAME_UNIQUE_INDEX = "uq_ref_activity_categories_name_lower"
+WEIGHT_TOTAL_TARGET = 100
+
 
 class ActivityCategoriesService:
     @staticmethod
-    def add_activity_categories(db: Session, data: ActivityCategoriesAdd, user_id: str) -> ActivityCategories:
-        existing = (
-            db.query(ActivityCategories)
-            .filter(
-                ActivityCategories.name.ilike(data.name),
-                ActivityCategories.deleted_at.is_(None),
-            )
-            .first()
-        )
-        if existing:
-            raise APIException(
+    def _map_integrity_error(error: IntegrityError) -> Exception:
+        if is_unique_violation(error, NAME_UNIQUE_INDEX):
+            return APIException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 message="Activity categories name already exists",
             )
-        ac = ActivityCategories(
+        return error
+
+    @staticmethod
+    async def _write(db: AsyncSession, statement):
+        """Jalankan satu statement DML ... RETURNING lalu commit; hasilnya baris yang dikembalikan."""
+        try:
+            result = await db.scalar(statement)
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise ActivityCategoriesService._map_integrity_error(e)
+        if result is not None:
+            ActivityCategoriesService._invalidate()
+        return result
+
+    @staticmethod
+    def _invalidate() -> None:
+        invalidate_counts(ActivityCategories.__tablename__)
+        invalidate_table_version(ActivityCategories.__tablename__)
+        activity_categories_cache.clear()
+
+    @staticmethod
+    async def add_activity_categories(db: AsyncSession, data: ActivityCategoriesAdd, user_id: str) -> ActivityCategories:
+        return await ActivityCategoriesService._write(db, insert(ActivityCategories).values(
             name=data.name,
             is_active=True,
             created_by=user_id,
             updated_by=user_id,
-        )
-        db.add(ac)
-        db.commit()
-        db.refresh(ac)
-        return ac
+        ).returning(ActivityCategories))
 
     @staticmethod
-    def list_activity_categories(
-        db: Session,
+    async def list_activity_categories(
+        db: AsyncSession,
         page: int = 1,
         limit: int = 10,
         filter: Optional[str] = None,
         sort_order: str = "asc",
         is_active: Optional[bool] = None,
-    ) -> List[ActivityCategories]:
-        query = db.query(ActivityCategories).filter(ActivityCategories.deleted_at.is_(None))
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        rank: bool = False,
+    ) -> Tuple[List[ActivityCategories], Optional[int], Optional[str]]:
+        query = select(ActivityCategories).where(ActivityCategories.deleted_at.is_(None))
         if is_active is not None:
-            query = query.filter(ActivityCategories.is_active.is_(is_active))
+            query = query.where(ActivityCategories.is_active.is_(is_active))
         if filter:
-            query = query.filter(
+            # ILIKE '%x%' dilayani index GIN pg_trgm pada name
+            query = query.where(
                 or_(
                     ActivityCategories.name.ilike(f"%{filter}%"),
                 )
             )
-        if sort_order == "desc":
-            query = query.order_by(ActivityCategories.name.desc())
-        else:
-            query = query.order_by(ActivityCategories.name.asc())
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+        if rank and filter:
+            if cursor:
+                raise APIException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    message="Cursor pagination is not available when ranking by relevance",
+                )
+            page_query = (
+                query.order_by(
+                    func.similarity(ActivityCategories.name, filter).desc(),
+                    ActivityCategories.name.asc(),
+                    ActivityCategories.id.asc(),
+                )
+                .offset((page - 1) * limit)
+                .limit(limit)
+            )
+            items, total = await fetch_page(
+                db, query, page_query, total_mode, ActivityCategories.__tablename__, (filter, is_active),
+            )
+            return items, total, None
+
+        page_query = keyset_page(query, ActivityCategories.name, ActivityCategories.id, limit, sort_order, cursor)
+        if not cursor:
+            page_query = page_query.offset((page - 1) * limit)
+        rows, total = await fetch_page(
+            db, query, page_query, total_mode, ActivityCategories.__tablename__, (filter, is_active),
+        )
+        items, next_cursor = keyset_next_cursor(rows, limit, sort_order, "name")
+        return items, total, next_cursor
 
     @staticmethod
-    def update_activity_categories(db: Session, activity_categories_id: str, data: ActivityCategoriesUpdate, user_id: str) -> ActivityCategories:
-        ac = db.query(ActivityCategories).filter(ActivityCategories.id == activity_categories_id).first()
-        if not ac:
-            raise APIException(
+    async def list_activity_categories_cached(
+        db: AsyncSession,
+        page: int = 1,
+        limit: int = 10,
+        filter: Optional[str] = None,
+        sort_order: str = "asc",
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        rank: bool = False,
+        version: Optional[str] = None,
+    ) -> ListPage:
+        async def load() -> ListPage:
+            items, total, next_cursor = await ActivityCategoriesService.list_activity_categories(
+                db, page, limit, filter, sort_order, is_active, cursor, total_mode, rank,
+            )
+            return ListPage(
+                [ActivityCategoriesListItem.model_validate(r) for r in items], total, next_cursor,
+            )
+
+        key = (filter, page, limit, sort_order, is_active, cursor, total_mode, rank, version)
+        return await activity_categories_cache.get_or_load(key, load)
+
+    @staticmethod
+    async def _missing_or_conflict(db: AsyncSession, activity_categories_id: str) -> APIException:
+        """Dipanggil hanya saat UPDATE tidak mengenai baris: bedakan 404 dan konflik versi."""
+        current = await db.scalar(select(ActivityCategories.version).where(
+            ActivityCategories.id == activity_categories_id,
+            ActivityCategories.deleted_at.is_(None),
+        ))
+        if current is None:
+            return APIException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 message="Activity categories not found",
             )
-        existing = (
-            db.query(ActivityCategories)
-            .filter(
-                ActivityCategories.name.ilike(data.name),
-                ActivityCategories.id != ac.id,
-            )
-            .first()
+        return APIException(
+            status_code=status.HTTP_409_CONFLICT,
+            message="Activity categories was modified by another request",
+            details={"current_version": current},
         )
-        if existing:
-            raise APIException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message="Activity_Categories name already exists",
-            )
-        ac.name = data.name
-        ac.is_active = data.is_active
-        ac.updated_by = user_id
-        db.commit()
-        db.refresh(ac)
+
+    @staticmethod
+    def _target(activity_categories_id: str, expected_version: Optional[int]):
+        conditions = [ActivityCategories.id == activity_categories_id, ActivityCategories.deleted_at.is_(None)]
+        if expected_version is not None:
+            conditions.append(ActivityCategories.version == expected_version)
+        return conditions
+
+    @staticmethod
+    async def update_activity_categories(
+        db: AsyncSession,
+        activity_categories_id: str,
+        data: ActivityCategoriesUpdate,
+        user_id: str,
+        expected_version: Optional[int] = None,
+    ) -> ActivityCategories:
+        values = data.model_dump(include={"name", "is_active"}, exclude_none=True)
+        ac = await ActivityCategoriesService._write(
+            db,
+            update(ActivityCategories)
+            .where(*ActivityCategoriesService._target(activity_categories_id, expected_version))
+            .values(**values, updated_by=user_id, version=ActivityCategories.version + 1)
+            .returning(ActivityCategories)
+            .execution_options(synchronize_session=False),
+        )
+        if ac is None:
+            raise await ActivityCategoriesService._missing_or_conflict(db, activity_categories_id)
         return ac
 
     @staticmethod
-    def delete_activity_categories(db: Session, activity_categories_id: str, user_id: str) -> None:
-        ac = db.query(ActivityCategories).filter(ActivityCategories.id == activity_categories_id).first()
-        if not ac:
+    async def delete_activity_categories(
+        db: AsyncSession,
+        activity_categories_id: str,
+        user_id: str,
+        expected_version: Optional[int] = None,
+    ) -> None:
+        deleted = await ActivityCategoriesService._write(
+            db,
+            update(ActivityCategories)
+            .where(*ActivityCategoriesService._target(activity_categories_id, expected_version))
+            .values(deleted_at=func.now(), updated_by=user_id, version=ActivityCategories.version + 1)
+            .returning(ActivityCategories.id)
+            .execution_options(synchronize_session=False),
+        )
+        if deleted is None:
+            raise await ActivityCategoriesService._missing_or_conflict(db, activity_categories_id)
+
+    @staticmethod
+    async def _write_batch(
+        db: AsyncSession,
+        statement,
+        ids: Sequence[UUID],
+        outcome: BatchItemStatus,
+        atomic: bool,
+    ) -> Dict[str, Any]:
+        """Satu UPDATE ... FROM VALUES untuk seluruh batch, lalu hasil per id dalam transaksi yang sama."""
+        try:
+            rows = (await db.execute(statement)).all()
+            results = {row.id: BatchItemResult(id=row.id, status=outcome, version=row.version) for row in rows}
+            results.update(await classify_missing(db, ActivityCategories, [i for i in ids if i not in results]))
+            if atomic and len(rows) < len(ids):
+                await db.rollback()
+                raise batch_rejected(ids, results)
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise ActivityCategoriesService._map_integrity_error(e)
+        if rows:
+            ActivityCategoriesService._invalidate()
+        return batch_response(ids, results)
+
+    @staticmethod
+    async def update_activity_categories_batch(
+        db: AsyncSession,
+        items: List[ActivityCategoriesBatchUpdateItem],
+        user_id: str,
+        atomic: bool = False,
+    ) -> Dict[str, Any]:
+        ids = [item.id for item in items]
+        check_batch(ids)
+        changes = batch_values(
+            "changes",
+            [("name", String()), ("is_active", Boolean())],
+            [(item.id, item.version, item.name, item.is_active) for item in items],
+        )
+        return await ActivityCategoriesService._write_batch(
+            db,
+            update(ActivityCategories)
+            .where(*target_rows(ActivityCategories, changes))
+            .values(
+                **changed_values(ActivityCategories, changes, ["name", "is_active"]),
+                updated_by=user_id,
+                version=ActivityCategories.version + 1,
+            )
+            .returning(ActivityCategories.id, ActivityCategories.version)
+            .execution_options(synchronize_session=False),
+            ids,
+            BatchItemStatus.UPDATED,
+            atomic,
+        )
+
+    @staticmethod
+    async def delete_activity_categories_batch(
+        db: AsyncSession,
+        items: List[BatchDeleteItem],
+        user_id: str,
+        atomic: bool = False,
+    ) -> Dict[str, Any]:
+        ids = [item.id for item in items]
+        check_batch(ids)
+        targets = batch_values("targets", [], [(item.id, item.version) for item in items])
+        return await ActivityCategoriesService._write_batch(
+            db,
+            update(ActivityCategories)
+            .where(*target_rows(ActivityCategories, targets))
+            .values(deleted_at=func.now(), updated_by=user_id, version=ActivityCategories.version + 1)
+            .returning(ActivityCategories.id, ActivityCategories.version)
+            .execution_options(synchronize_session=False),
+            ids,
+            BatchItemStatus.DELETED,
+            atomic,
+        )
+
+    @staticmethod
+    async def category_weight_summary(
+        db: AsyncSession,
+        category_id: Optional[str] = None,
+        incomplete_only: bool = False,
+    ) -> List[CategoryWeightSummary]:
+        weight_total = func.coalesce(CategoryWeights.weight_total, 0)
+        query = (
+            select(
+                ActivityCategories.id,
+                ActivityCategories.name,
+                ActivityCategories.is_active,
+                weight_total.label("weight_total"),
+                func.coalesce(CategoryWeights.standards_count, 0).label("standards_count"),
+                (weight_total == WEIGHT_TOTAL_TARGET).label("is_complete"),
+            )
+            .outerjoin(CategoryWeights, CategoryWeights.category_id == ActivityCategories.id)
+            .where(ActivityCategories.deleted_at.is_(None))
+            .order_by(ActivityCategories.name, ActivityCategories.id)
+        )
+        if category_id:
+            query = query.where(ActivityCategories.id == category_id)
+        if incomplete_only:
+            query = query.where(weight_total != WEIGHT_TOTAL_TARGET)
+        rows = (await db.execute(query)).all()
+        if category_id and not rows:
             raise APIException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 message="Activity categories not found",
             )
-        ac.deleted_at = datetime.now()
-        ac.updated_by = user_id
-        db.commit()
+        return [CategoryWeightSummary.model_validate(row) for row in rows]
+
+    @staticmethod
+    async def export_activity_categories(
+        is_active: Optional[bool] = None,
+    ) -> AsyncIterator[List[ActivityCategoriesResponse]]:
+        query = select(ActivityCategories).where(ActivityCategories.deleted_at.is_(None))
+        if is_active is not None:
+            query = query.where(ActivityCategories.is_active.is_(is_active))
+        query = query.order_by(ActivityCategories.name, ActivityCategories.id).execution_options(
+            yield_per=settings.export_batch_size,
+        )
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(query)
+            async for partition in result.partitions():
+                yield [ActivityCategoriesResponse.model_validate(r) for r in partition]
+                db.expunge_all()
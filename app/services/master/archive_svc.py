@@ -0,0 +1,322 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Table, and_, delete, exists, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import status
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.activity_cateories import ActivityCategories
+from app.models.activity_records import ActivityRecords
+from app.models.archive import ArchivedActivityCategories, ArchivedPerformanceStandards
+from app.models.category_weights import CategoryWeights
+from app.models.performance_standards import PerformanceStandards
+from app.services.master.list_cache import activity_categories_cache, invalidate_performance_standards
+from app.services.master.performance_standards_dto import PerformanceStandardService
+from app.utils.db_errors import is_unique_violation
+from app.utils.etag import invalidate_table_version
+from app.utils.pagination import invalidate_counts
+from app.utils.response.exception import APIException
+
+logger = logging.getLogger(__name__)
+
+# Kunci advisory supaya job arsip tidak jalan bersamaan di beberapa proses
+ARCHIVE_LOCK_KEY = 720022
+
+_standards = PerformanceStandards.__table__
+_categories = ActivityCategories.__table__
+_archived_standards = ArchivedPerformanceStandards.__table__
+_archived_categories = ArchivedActivityCategories.__table__
+
+
+def _copy_columns(table: Table, source: Optional[Table] = None) -> List:
+    """Kolom `table` yang disalin antara tabel utama dan arsip, diambil dari `source`.
+
+    Kolom generated (search_vector) dihitung ulang oleh database, tidak ikut disalin.
+    """
+    source = table if source is None else source
+    return [source.c[column.name] for column in table.c if column.computed is None]
+
+
+def _standard_archivable(cutoff: datetime):
+    # Standar yang masih dirujuk activity record tetap di tabel utama demi FK
+    return and_(
+        PerformanceStandards.deleted_at < cutoff,
+        ~exists().where(ActivityRecords.standard_id == PerformanceStandards.id),
+    )
+
+
+def _category_archivable(cutoff: datetime):
+    return and_(
+        ActivityCategories.deleted_at < cutoff,
+        ~exists().where(ActivityRecords.category_id == ActivityCategories.id),
+        ~exists().where(PerformanceStandards.category_id == ActivityCategories.id),
+    )
+
+
+def _invalidate_master_caches(category_ids: Sequence[UUID]) -> None:
+    invalidate_counts(ActivityCategories.__tablename__)
+    invalidate_table_version(ActivityCategories.__tablename__)
+    activity_categories_cache.clear()
+    invalidate_counts(PerformanceStandards.__tablename__)
+    invalidate_table_version(PerformanceStandards.__tablename__)
+    for category_id in category_ids:
+        invalidate_performance_standards(category_id)
+
+
+class ArchiveService:
+    @staticmethod
+    def cutoff(retention_days: Optional[int] = None) -> datetime:
+        days = settings.archive_retention_days if retention_days is None else retention_days
+        return datetime.now(timezone.utc) - timedelta(days=days)
+
+    @staticmethod
+    async def report(db: AsyncSession, retention_days: Optional[int] = None) -> Dict[str, Any]:
+        """Dry-run: apa yang akan dipindah oleh `archive` dengan retensi yang sama."""
+        cutoff = ArchiveService.cutoff(retention_days)
+        deleted_standards = PerformanceStandards.deleted_at < cutoff
+        deleted_categories = ActivityCategories.deleted_at < cutoff
+        standards_eligible = await db.scalar(
+            select(func.count()).select_from(PerformanceStandards).where(_standard_archivable(cutoff))
+        )
+        standards_expired = await db.scalar(
+            select(func.count()).select_from(PerformanceStandards).where(deleted_standards)
+        )
+        # Kategori ikut dihitung kalau semua standarnya juga akan diarsip di run yang sama
+        categories_eligible = await db.scalar(
+            select(func.count()).select_from(ActivityCategories).where(
+                deleted_categories,
+                ~exists().where(ActivityRecords.category_id == ActivityCategories.id),
+                ~exists().where(
+                    PerformanceStandards.category_id == ActivityCategories.id,
+                    ~_standard_archivable(cutoff),
+                ),
+            )
+        )
+        categories_expired = await db.scalar(
+            select(func.count()).select_from(ActivityCategories).where(deleted_categories)
+        )
+        return {
+            "dry_run": True,
+            "cutoff": cutoff.isoformat(),
+            "performance_standards": {
+                "eligible": standards_eligible,
+                "blocked": standards_expired - standards_eligible,
+                "archived": await db.scalar(select(func.count()).select_from(ArchivedPerformanceStandards)),
+            },
+            "activity_categories": {
+                "eligible": categories_eligible,
+                "blocked": categories_expired - categories_eligible,
+                "archived": await db.scalar(select(func.count()).select_from(ArchivedActivityCategories)),
+            },
+        }
+
+    @staticmethod
+    async def _move_standards(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+        ids = (await db.scalars(
+            select(PerformanceStandards.id)
+            .where(_standard_archivable(cutoff))
+            .order_by(PerformanceStandards.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )).all()
+        if not ids:
+            return 0
+        rows = (await db.execute(
+            delete(_standards).where(_standards.c.id.in_(ids)).returning(*_copy_columns(_standards))
+        )).mappings().all()
+        await db.execute(insert(_archived_standards), [dict(row) for row in rows])
+        return len(rows)
+
+    @staticmethod
+    async def _move_categories(db: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+        ids = (await db.scalars(
+            select(ActivityCategories.id)
+            .where(_category_archivable(cutoff))
+            .order_by(ActivityCategories.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )).all()
+        if not ids:
+            return 0
+        # Baris agregat bobot menunjuk kategori lewat FK, jadi dihapus lebih dulu
+        await db.execute(delete(CategoryWeights).where(CategoryWeights.category_id.in_(ids)))
+        rows = (await db.execute(
+            delete(_categories).where(_categories.c.id.in_(ids)).returning(*_copy_columns(_categories))
+        )).mappings().all()
+        await db.execute(insert(_archived_categories), [dict(row) for row in rows])
+        return len(rows)
+
+    @staticmethod
+    async def archive(
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Pindahkan baris soft-deleted yang lewat retensi ke tabel arsip.
+
+        Standar diproses lebih dulu supaya kategori yang standarnya sudah
+        pindah ikut memenuhi syarat. Setiap batch satu transaksi pendek.
+        """
+        cutoff = ArchiveService.cutoff(retention_days)
+        batch_size = batch_size or settings.archive_batch_size
+        moved = {"performance_standards": 0, "activity_categories": 0}
+        for key, move in (
+            ("performance_standards", ArchiveService._move_standards),
+            ("activity_categories", ArchiveService._move_categories),
+        ):
+            while True:
+                async with AsyncSessionLocal() as db:
+                    if not await db.scalar(select(func.pg_try_advisory_xact_lock(ARCHIVE_LOCK_KEY))):
+                        return {"dry_run": False, "cutoff": cutoff.isoformat(), "skipped": True, **moved}
+                    count = await move(db, cutoff, batch_size)
+                    await db.commit()
+                moved[key] += count
+                if count < batch_size:
+                    break
+                await asyncio.sleep(settings.archive_batch_pause_seconds)
+        if moved["activity_categories"] or moved["performance_standards"]:
+            invalidate_counts(ActivityCategories.__tablename__)
+            invalidate_counts(PerformanceStandards.__tablename__)
+            invalidate_table_version(ActivityCategories.__tablename__)
+            invalidate_table_version(PerformanceStandards.__tablename__)
+        return {"dry_run": False, "cutoff": cutoff.isoformat(), "skipped": False, **moved}
+
+    @staticmethod
+    async def restore(
+        db: AsyncSession,
+        category_ids: Sequence[UUID],
+        standard_ids: Sequence[UUID],
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """Kembalikan baris arsip ke tabel utama sebagai data aktif (deleted_at dikosongkan).
+
+        Kategori arsip dari standar yang dipulihkan ikut dipulihkan.
+        """
+        now = datetime.now(timezone.utc)
+        standard_rows = []
+        if standard_ids:
+            standard_rows = (await db.execute(
+                delete(_archived_standards).where(_archived_standards.c.id.in_(list(standard_ids)))
+                .returning(*_copy_columns(_standards, _archived_standards))
+            )).mappings().all()
+        wanted_categories = set(category_ids) | {row["category_id"] for row in standard_rows}
+        category_rows = []
+        if wanted_categories:
+            category_rows = (await db.execute(
+                delete(_archived_categories).where(_archived_categories.c.id.in_(list(wanted_categories)))
+                .returning(*_copy_columns(_categories, _archived_categories))
+            )).mappings().all()
+        if category_rows:
+            await db.execute(insert(_categories), [
+                {**row, "deleted_at": None, "updated_at": now, "updated_by": user_id} for row in category_rows
+            ])
+
+        if standard_rows:
+            parent_ids = {row["category_id"] for row in standard_rows}
+            live_parents = set((await db.scalars(
+                select(ActivityCategories.id).where(
+                    ActivityCategories.id.in_(list(parent_ids)),
+                    ActivityCategories.deleted_at.is_(None),
+                )
+            )).all())
+            if parent_ids - live_parents:
+                await db.rollback()
+                raise APIException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    message="Activity category of a restored standard is deleted; restore the category first",
+                    details={"category_ids": [str(i) for i in parent_ids - live_parents]},
+                )
+            await db.execute(insert(_standards), [
+                {**row, "deleted_at": None, "updated_at": now, "updated_by": user_id} for row in standard_rows
+            ])
+
+        try:
+            # Standar yang dipulihkan kembali dihitung ke bobot kategorinya
+            await PerformanceStandardService._check_weight_limit(db, [row["category_id"] for row in standard_rows])
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if is_unique_violation(e, "uq_ref_activity_categories_name_lower") or is_unique_violation(
+                e, "uq_ref_performance_standards_category_name_lower"
+            ):
+                raise APIException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    message="A live row with the same name already exists",
+                )
+            raise
+        _invalidate_master_caches([row["category_id"] for row in standard_rows])
+
+        restored_categories = {row["id"] for row in category_rows}
+        restored_standards = {row["id"] for row in standard_rows}
+        return {
+            "restored_activity_categories": [str(i) for i in restored_categories],
+            "restored_performance_standards": [str(i) for i in restored_standards],
+            "not_found": [str(i) for i in (set(category_ids) - restored_categories) | (set(standard_ids) - restored_standards)],
+        }
+
+
+class ArchiveJob:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.runs = 0
+        self.failed_runs = 0
+        self.archived_standards = 0
+        self.archived_categories = 0
+        self.last_run_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def run_once(self, retention_days: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            result = await ArchiveService.archive(retention_days)
+        except Exception:
+            self.failed_runs += 1
+            raise
+        self.runs += 1
+        self.archived_standards += result["performance_standards"]
+        self.archived_categories += result["activity_categories"]
+        self.last_run_at = datetime.now(timezone.utc)
+        return result
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Master data archival failed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "retention_days": settings.archive_retention_days,
+            "runs": self.runs,
+            "failed_runs": self.failed_runs,
+            "archived_performance_standards": self.archived_standards,
+            "archived_activity_categories": self.archived_categories,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+archive_job = ArchiveJob(interval=settings.archive_interval_seconds)
@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import cast, column, func, or_, select, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Integer, TypeEngine
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from fastapi import status
+
+from app.core.config import settings
+from app.services.master.schemas.batch_dto import BatchItemResult, BatchItemStatus
+from app.utils.response.exception import APIException
+
+
+def check_batch(ids: Sequence[UUID]) -> None:
+    if len(ids) > settings.batch_max_items:
+        raise APIException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            message=f"Batch is limited to {settings.batch_max_items} items",
+        )
+    seen = set()
+    duplicates = sorted({str(i) for i in ids if i in seen or seen.add(i)})
+    if duplicates:
+        raise APIException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message="Batch contains duplicate ids",
+            details={"ids": duplicates},
+        )
+
+
+def batch_values(name: str, columns: Sequence[Tuple[str, TypeEngine]], rows: List[Tuple[Any, ...]]):
+    """VALUES (id, version, ...) untuk UPDATE ... FROM; dua kolom pertama selalu id dan version."""
+    return values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("version", Integer),
+        *[column(n, t) for n, t in columns],
+        name=name,
+    ).data(rows)
+
+
+def target_rows(model, changes):
+    """Kondisi join baris tabel dengan VALUES; versi kosong berarti tanpa optimistic check."""
+    # Cast eksplisit: kolom VALUES yang seluruhnya NULL diberi tipe text oleh Postgres
+    return (
+        model.id == cast(changes.c.id, PG_UUID(as_uuid=True)),
+        model.deleted_at.is_(None),
+        or_(changes.c.version.is_(None), model.version == cast(changes.c.version, Integer)),
+    )
+
+
+def changed_values(model, changes, names: Sequence[str]) -> Dict[str, Any]:
+    """SET kolom = COALESCE(nilai baru, nilai lama): None di payload berarti tidak diubah."""
+    return {
+        name: func.coalesce(cast(changes.c[name], getattr(model, name).type), getattr(model, name))
+        for name in names
+    }
+
+
+async def classify_missing(db: AsyncSession, model, ids: Sequence[UUID]) -> Dict[UUID, BatchItemResult]:
+    """Id yang tidak terkena UPDATE: masih ada berarti versinya berbeda, selain itu not_found."""
+    if not ids:
+        return {}
+    current = dict((await db.execute(
+        select(model.id, model.version).where(model.id.in_(list(ids)), model.deleted_at.is_(None))
+    )).all())
+    return {
+        i: BatchItemResult(id=i, status=BatchItemStatus.CONFLICT, version=current[i], error="Version mismatch")
+        if i in current else BatchItemResult(id=i, status=BatchItemStatus.NOT_FOUND)
+        for i in ids
+    }
+
+
+def batch_response(ids: Sequence[UUID], results: Dict[UUID, BatchItemResult]) -> Dict[str, Any]:
+    ordered = [results[i] for i in ids]
+    summary = {"total": len(ordered)}
+    for item in BatchItemStatus:
+        summary[item.value] = sum(1 for r in ordered if r.status == item)
+    return {"summary": summary, "results": ordered}
+
+
+def batch_rejected(ids: Sequence[UUID], results: Dict[UUID, BatchItemResult]) -> APIException:
+    response = batch_response(ids, results)
+    return APIException(
+        status_code=status.HTTP_409_CONFLICT,
+        message="Batch was not applied because some items failed",
+        details={
+            "summary": response["summary"],
+            "results": [r.model_dump(mode="json") for r in response["results"]],
+        },
+    )
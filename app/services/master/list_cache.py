@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from pydantic_core import to_json
+
+from app.core.config import settings
+from app.utils.cache import ReadThroughCache, TTLCache
+
+
+class ListPage(NamedTuple):
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+def _page_bytes(page: ListPage) -> int:
+    return len(to_json(page.items))
+
+
+def _new_list_cache() -> ReadThroughCache[tuple, ListPage]:
+    return ReadThroughCache(
+        TTLCache(
+            max_entries=settings.list_cache_max_entries,
+            ttl_seconds=settings.list_cache_ttl_seconds,
+            max_bytes=settings.list_cache_max_bytes,
+            weigher=_page_bytes,
+        )
+    )
+
+
+# Key diakhiri versi tabel yang juga dipakai ETag, supaya write di worker lain
+# tidak membuat ETag baru dikirim bersama isi halaman lama.
+# Key activity categories: (filter, page, limit, sort_order, is_active, cursor, total_mode, rank, version)
+activity_categories_cache = _new_list_cache()
+# Key performance standards diawali category_id supaya write bisa menghapus per kategori:
+# (category_id, filter, page, limit, sort_order, cursor, total_mode, search_mode, rank, version)
+performance_standards_cache = _new_list_cache()
+
+
+def category_key(category_id: Any) -> Optional[str]:
+    return str(category_id).lower() if category_id else None
+
+
+def invalidate_performance_standards(category_id: Any) -> None:
+    changed = category_key(category_id)
+    performance_standards_cache.invalidate_where(lambda key: key[0] is None or key[0] == changed)
+
+
+def list_cache_stats() -> Dict[str, Any]:
+    return {
+        "activity_categories": activity_categories_cache.stats(),
+        "performance_standards": performance_standards_cache.stats(),
+    }
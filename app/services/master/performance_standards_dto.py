@@ -1,131 +1,585 @@
-from datetime import datetime
-from typing import List, Optional, Tuple
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from pydantic import ValidationError
+from sqlalchemy import Numeric, String, Text, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from fastapi import status
 
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.models.activity_cateories import ActivityCategories
-from app.models.performance_standards import PerformanceStandards
-from app.services.master.schemas.performance_standards_dto import PerformanceStandardsAdd, PerformanceStandardsUpdate
+from app.models.category_weights import CategoryWeights
+from app.models.performance_standards import PerformanceStandards, PerformanceStandardsEvaluationMethod
+from app.services.master.activity_categories_svc import WEIGHT_TOTAL_TARGET
+from app.services.scoring.rules import RuleError, compile_rule
+from app.services.master.batch import (
+    batch_rejected,
+    batch_response,
+    batch_values,
+    changed_values,
+    check_batch,
+    classify_missing,
+    target_rows,
+)
+from app.services.master.list_cache import (
+    ListPage,
+    category_key,
+    invalidate_performance_standards,
+    performance_standards_cache,
+)
+from app.services.master.schemas.performance_standards_dto import (
+    PerformanceStandardsAdd,
+    PerformanceStandardsBatchUpdateItem,
+    PerformanceStandardsResponse,
+    PerformanceStandardsUpdate,
+)
+from app.services.master.schemas.batch_dto import BatchDeleteItem, BatchItemResult, BatchItemStatus
+from app.utils.db_errors import is_unique_violation
+from app.utils.etag import invalidate_table_version
+from app.utils.pagination import TotalMode, fetch_page, invalidate_counts, keyset_next_cursor, keyset_page
 from app.utils.response.exception import APIException
+from app.utils.search import SEARCH_CONFIG, SearchMode
+
+
+NAME_UNIQUE_INDEX = "uq_ref_performance_standards_category_name_lower"
+BATCH_UPDATE_FIELDS = [
+    ("name", String()),
+    ("description", Text()),
+    ("evaluation_method", String()),
+    ("scoring_rules", Text()),
+    ("evaluation_guide", Text()),
+    ("weight_percentage", Numeric()),
+]
 
 
 class PerformanceStandardService:
     @staticmethod
-    def add_performance_standards(db: Session, data: PerformanceStandardsAdd, user_id: str) -> PerformanceStandards:
+    def _map_integrity_error(error: IntegrityError) -> Exception:
+        if is_unique_violation(error, NAME_UNIQUE_INDEX):
+            return APIException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="Performance standards name already exists in this category",
+            )
+        return error
+
+    @staticmethod
+    async def _execute_all(db: AsyncSession, statement) -> list:
+        try:
+            return (await db.execute(statement)).all()
+        except IntegrityError as e:
+            await db.rollback()
+            raise PerformanceStandardService._map_integrity_error(e)
+
+    @staticmethod
+    async def _execute(db: AsyncSession, statement):
+        rows = await PerformanceStandardService._execute_all(db, statement)
+        return rows[0] if rows else None
+
+    @staticmethod
+    async def _check_weight_limit(db: AsyncSession, category_ids: Sequence[UUID]) -> None:
+        """Rollback dan 400 kalau total bobot salah satu kategori melebihi target (bila diaktifkan)."""
+        if not settings.enforce_category_weight_limit or not category_ids:
+            return
+        # Trigger sudah memperbarui total di flush; baris agregat terkunci
+        # sampai commit sehingga write paralel di kategori yang sama antre
+        await db.flush()
+        over_limit = await db.scalar(
+            select(func.count()).select_from(CategoryWeights).where(
+                CategoryWeights.category_id.in_(list(set(category_ids))),
+                CategoryWeights.weight_total > WEIGHT_TOTAL_TARGET,
+            )
+        )
+        if over_limit:
+            await db.rollback()
+            raise APIException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=f"Total weight_percentage of a category cannot exceed {WEIGHT_TOTAL_TARGET}%",
+            )
+
+    @staticmethod
+    async def _commit(db: AsyncSession, *category_ids: UUID, check_weights: bool = False) -> None:
+        try:
+            if check_weights:
+                await PerformanceStandardService._check_weight_limit(db, category_ids)
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise PerformanceStandardService._map_integrity_error(e)
+        invalidate_counts(PerformanceStandards.__tablename__)
+        invalidate_table_version(PerformanceStandards.__tablename__)
+        for category_id in category_ids:
+            invalidate_performance_standards(category_id)
+
+    @staticmethod
+    async def add_performance_standards(db: AsyncSession, data: PerformanceStandardsAdd, user_id: str) -> PerformanceStandards:
         # Pastikan kategori aktivitas ada
-        category = db.query(ActivityCategories).filter(
+        category = await db.scalar(select(ActivityCategories.id).where(
             ActivityCategories.id == data.category_id,
             ActivityCategories.deleted_at.is_(None)
-        ).first()
+        ))
         if not category:
             raise APIException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 message="Activity category not found",
             )
-        existing = db.query(PerformanceStandards).filter(
-            PerformanceStandards.name.ilike(data.name),
-            PerformanceStandards.category_id == data.category_id,
-            PerformanceStandards.deleted_at.is_(None),
-        ).first()
-        if existing:
-            raise APIException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message="Performance standards name already exists in this category",
-            )
-        ps = PerformanceStandards(
+        (ps,) = await PerformanceStandardService._execute(db, insert(PerformanceStandards).values(
             name=data.name,
             category_id=data.category_id,
             description=data.description,
-            evaluation_method=data.evaluation_method,
+            evaluation_method=data.evaluation_method.value,
             scoring_rules=data.scoring_rules,
             evaluation_guide=data.evaluation_guide,
             weight_percentage=data.weight_percentage,
             created_by=user_id,
             updated_by=user_id,
-        )
-        db.add(ps)
-        db.commit()
-        db.refresh(ps)
+        ).returning(PerformanceStandards))
+        await PerformanceStandardService._commit(db, data.category_id, check_weights=True)
         return ps
 
     @staticmethod
-    def list_performance_standards(
-        db: Session,
+    async def list_performance_standards(
+        db: AsyncSession,
         page: int = 1,
         limit: int = 10,
         filter: Optional[str] = None,
         sort_order: str = "asc",
         category_id: Optional[str] = None,
-    ) -> Tuple[List[PerformanceStandards], int]:
-        query = db.query(PerformanceStandards).filter(PerformanceStandards.deleted_at.is_(None))
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        search_mode: SearchMode = SearchMode.SUBSTRING,
+        rank: bool = False,
+    ) -> Tuple[List[PerformanceStandards], Optional[int], Optional[str]]:
+        query = select(PerformanceStandards).where(PerformanceStandards.deleted_at.is_(None))
         if category_id:
-            query = query.filter(PerformanceStandards.category_id == category_id)
-        if filter:
-            query = query.filter(
+            query = query.where(PerformanceStandards.category_id == category_id)
+        relevance = None
+        if filter and search_mode == SearchMode.FULLTEXT:
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, filter)
+            query = query.where(PerformanceStandards.search_vector.op("@@")(ts_query))
+            relevance = func.ts_rank_cd(PerformanceStandards.search_vector, ts_query)
+        elif filter:
+            # ILIKE '%x%' dilayani index GIN pg_trgm pada name dan description
+            query = query.where(
                 or_(
                     PerformanceStandards.name.ilike(f"%{filter}%"),
                     PerformanceStandards.description.ilike(f"%{filter}%"),
                 )
             )
-        if sort_order == "desc":
-            query = query.order_by(PerformanceStandards.name.desc())
-        else:
-            query = query.order_by(PerformanceStandards.name.asc())
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+            relevance = func.greatest(
+                func.similarity(PerformanceStandards.name, filter),
+                func.word_similarity(filter, func.coalesce(PerformanceStandards.description, "")),
+            )
+
+        count_key = (filter, search_mode, category_id)
+        if rank and relevance is not None:
+            if cursor:
+                raise APIException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    message="Cursor pagination is not available when ranking by relevance",
+                )
+            page_query = (
+                query.order_by(relevance.desc(), PerformanceStandards.name.asc(), PerformanceStandards.id.asc())
+                .offset((page - 1) * limit)
+                .limit(limit)
+            )
+            items, total = await fetch_page(
+                db, query, page_query, total_mode, PerformanceStandards.__tablename__, count_key,
+            )
+            return items, total, None
+
+        page_query = keyset_page(query, PerformanceStandards.name, PerformanceStandards.id, limit, sort_order, cursor)
+        if not cursor:
+            page_query = page_query.offset((page - 1) * limit)
+        rows, total = await fetch_page(
+            db, query, page_query, total_mode, PerformanceStandards.__tablename__, count_key,
+        )
+        items, next_cursor = keyset_next_cursor(rows, limit, sort_order, "name")
+        return items, total, next_cursor
 
     @staticmethod
-    def update_performance_standards(db: Session, performance_standards_id: str, data: PerformanceStandardsUpdate, user_id: str) -> PerformanceStandards:
-        ps = db.query(PerformanceStandards).filter(
+    async def list_performance_standards_cached(
+        db: AsyncSession,
+        page: int = 1,
+        limit: int = 10,
+        filter: Optional[str] = None,
+        sort_order: str = "asc",
+        category_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        search_mode: SearchMode = SearchMode.SUBSTRING,
+        rank: bool = False,
+        version: Optional[str] = None,
+    ) -> ListPage:
+        async def load() -> ListPage:
+            items, total, next_cursor = await PerformanceStandardService.list_performance_standards(
+                db, page, limit, filter, sort_order, category_id, cursor, total_mode,
+                search_mode=search_mode, rank=rank,
+            )
+            return ListPage(
+                [PerformanceStandardsResponse.model_validate(r) for r in items], total, next_cursor,
+            )
+
+        key = (category_key(category_id), filter, page, limit, sort_order, cursor, total_mode, search_mode, rank, version)
+        return await performance_standards_cache.get_or_load(key, load)
+
+    @staticmethod
+    async def _missing_or_conflict(db: AsyncSession, performance_standards_id: str) -> APIException:
+        """Dipanggil hanya saat UPDATE tidak mengenai baris: bedakan 404 dan konflik versi."""
+        current = await db.scalar(select(PerformanceStandards.version).where(
             PerformanceStandards.id == performance_standards_id,
-            PerformanceStandards.deleted_at.is_(None)
-        ).first()
-        if not ps:
-            raise APIException(
+            PerformanceStandards.deleted_at.is_(None),
+        ))
+        if current is None:
+            return APIException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 message="Performance standards not found",
             )
-        if data.name and data.name != ps.name:
-            existing = db.query(PerformanceStandards).filter(
-                PerformanceStandards.name.ilike(data.name),
-                PerformanceStandards.category_id == ps.category_id,
-                PerformanceStandards.id != ps.id,
-                PerformanceStandards.deleted_at.is_(None),
-            ).first()
-            if existing:
+        return APIException(
+            status_code=status.HTTP_409_CONFLICT,
+            message="Performance standards was modified by another request",
+            details={"current_version": current},
+        )
+
+    @staticmethod
+    def _target(performance_standards_id: str, expected_version: Optional[int]):
+        conditions = [PerformanceStandards.id == performance_standards_id, PerformanceStandards.deleted_at.is_(None)]
+        if expected_version is not None:
+            conditions.append(PerformanceStandards.version == expected_version)
+        return conditions
+
+    @staticmethod
+    async def update_performance_standards(
+        db: AsyncSession,
+        performance_standards_id: str,
+        data: PerformanceStandardsUpdate,
+        user_id: str,
+        expected_version: Optional[int] = None,
+    ) -> PerformanceStandards:
+        values = data.model_dump(mode="json", exclude={"category_id", "version"}, exclude_none=True)
+        # Bobot lama dibaca di statement yang sama lewat UPDATE ... FROM, untuk cek batas bobot
+        previous = aliased(PerformanceStandards)
+        previous_weight = (
+            select(previous.id, previous.weight_percentage)
+            .where(previous.id == performance_standards_id)
+            .subquery("previous")
+        )
+        row = await PerformanceStandardService._execute(
+            db,
+            update(PerformanceStandards)
+            .where(
+                PerformanceStandards.id == previous_weight.c.id,
+                *PerformanceStandardService._target(performance_standards_id, expected_version),
+            )
+            .values(**values, updated_by=user_id, version=PerformanceStandards.version + 1)
+            .returning(PerformanceStandards, previous_weight.c.weight_percentage)
+            .execution_options(synchronize_session=False),
+        )
+        if row is None:
+            raise await PerformanceStandardService._missing_or_conflict(db, performance_standards_id)
+        ps, old_weight = row
+
+        # Rule divalidasi terhadap hasil gabungan payload dan data lama yang dikembalikan RETURNING
+        if ps.evaluation_method == PerformanceStandardsEvaluationMethod.SYSTEM:
+            try:
+                if ps.scoring_rules is None:
+                    raise RuleError("scoring_rules is required when evaluation_method is SYSTEM")
+                compile_rule(ps.scoring_rules)
+            except RuleError as e:
+                await db.rollback()
                 raise APIException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    message="Performance standards name already exists in this category",
+                    message=f"Invalid scoring_rules: {e}",
                 )
-            ps.name = data.name
-        if data.description is not None:
-            ps.description = data.description
-        if data.evaluation_method is not None:
-            ps.evaluation_method = data.evaluation_method
-        if data.scoring_rules is not None:
-            ps.scoring_rules = data.scoring_rules
-        if data.evaluation_guide is not None:
-            ps.evaluation_guide = data.evaluation_guide
-        if data.weight_percentage is not None:
-            ps.weight_percentage = data.weight_percentage
-        ps.updated_by = user_id
-        db.commit()
-        db.refresh(ps)
+        await PerformanceStandardService._commit(
+            db, ps.category_id, check_weights=ps.weight_percentage > old_weight,
+        )
         return ps
 
     @staticmethod
-    def delete_performance_standards(db: Session, performance_standards_id: str, user_id: str) -> None:
-        ps = db.query(PerformanceStandards).filter(
-            PerformanceStandards.id == performance_standards_id,
-            PerformanceStandards.deleted_at.is_(None)
-        ).first()
-        if not ps:
-            raise APIException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                message="Performance standards not found",
+    async def delete_performance_standards(
+        db: AsyncSession,
+        performance_standards_id: str,
+        user_id: str,
+        expected_version: Optional[int] = None,
+    ) -> None:
+        row = await PerformanceStandardService._execute(
+            db,
+            update(PerformanceStandards)
+            .where(*PerformanceStandardService._target(performance_standards_id, expected_version))
+            .values(deleted_at=func.now(), updated_by=user_id, version=PerformanceStandards.version + 1)
+            .returning(PerformanceStandards.category_id)
+            .execution_options(synchronize_session=False),
+        )
+        if row is None:
+            raise await PerformanceStandardService._missing_or_conflict(db, performance_standards_id)
+        await PerformanceStandardService._commit(db, row.category_id)
+
+    @staticmethod
+    async def _finish_batch(
+        db: AsyncSession,
+        ids: Sequence[UUID],
+        results: Dict[UUID, BatchItemResult],
+        rows: list,
+        atomic: bool,
+        check_weights: bool = False,
+    ) -> Dict[str, Any]:
+        results.update(await classify_missing(db, PerformanceStandards, [i for i in ids if i not in results]))
+        if atomic and len(rows) < len(ids):
+            await db.rollback()
+            raise batch_rejected(ids, results)
+        if rows:
+            await PerformanceStandardService._commit(
+                db, *{row.category_id for row in rows}, check_weights=check_weights,
+            )
+        else:
+            await db.rollback()
+        return batch_response(ids, results)
+
+    @staticmethod
+    async def _invalid_batch_rules(
+        db: AsyncSession,
+        items: List[PerformanceStandardsBatchUpdateItem],
+    ) -> Dict[UUID, BatchItemResult]:
+        """Rule SYSTEM divalidasi sebelum UPDATE dari gabungan payload dan data lama (dikunci)."""
+        touched = [item for item in items if item.evaluation_method is not None or item.scoring_rules is not None]
+        if not touched:
+            return {}
+        current = {row.id: row for row in (await db.execute(
+            select(PerformanceStandards.id, PerformanceStandards.evaluation_method, PerformanceStandards.scoring_rules)
+            .where(
+                PerformanceStandards.id.in_([item.id for item in touched]),
+                PerformanceStandards.deleted_at.is_(None),
             )
-        ps.deleted_at = datetime.now()
-        ps.updated_by = user_id
-        db.commit()
+            .with_for_update()
+        )).all()}
+        invalid: Dict[UUID, BatchItemResult] = {}
+        for item in touched:
+            row = current.get(item.id)
+            if row is None:
+                continue
+            method = item.evaluation_method.value if item.evaluation_method is not None else row.evaluation_method.value
+            if method != PerformanceStandardsEvaluationMethod.SYSTEM.value:
+                continue
+            rules = item.scoring_rules if item.scoring_rules is not None else row.scoring_rules
+            try:
+                if rules is None:
+                    raise RuleError("scoring_rules is required when evaluation_method is SYSTEM")
+                compile_rule(rules)
+            except RuleError as e:
+                invalid[item.id] = BatchItemResult(
+                    id=item.id, status=BatchItemStatus.INVALID, error=f"Invalid scoring_rules: {e}",
+                )
+        return invalid
+
+    @staticmethod
+    async def update_performance_standards_batch(
+        db: AsyncSession,
+        items: List[PerformanceStandardsBatchUpdateItem],
+        user_id: str,
+        atomic: bool = False,
+    ) -> Dict[str, Any]:
+        ids = [item.id for item in items]
+        check_batch(ids)
+        results = await PerformanceStandardService._invalid_batch_rules(db, items)
+        applicable = [item for item in items if item.id not in results]
+        rows = []
+        if applicable:
+            changes = batch_values("changes", BATCH_UPDATE_FIELDS, [
+                (
+                    item.id,
+                    item.version,
+                    item.name,
+                    item.description,
+                    item.evaluation_method.value if item.evaluation_method is not None else None,
+                    json.dumps(item.scoring_rules) if item.scoring_rules is not None else None,
+                    item.evaluation_guide,
+                    item.weight_percentage,
+                )
+                for item in applicable
+            ])
+            previous = aliased(PerformanceStandards)
+            previous_weight = (
+                select(previous.id, previous.weight_percentage)
+                .where(previous.id.in_([item.id for item in applicable]))
+                .subquery("previous")
+            )
+            rows = await PerformanceStandardService._execute_all(
+                db,
+                update(PerformanceStandards)
+                .where(PerformanceStandards.id == previous_weight.c.id, *target_rows(PerformanceStandards, changes))
+                .values(
+                    **changed_values(PerformanceStandards, changes, [name for name, _ in BATCH_UPDATE_FIELDS]),
+                    updated_by=user_id,
+                    version=PerformanceStandards.version + 1,
+                )
+                .returning(
+                    PerformanceStandards.id,
+                    PerformanceStandards.version,
+                    PerformanceStandards.category_id,
+                    PerformanceStandards.weight_percentage,
+                    previous_weight.c.weight_percentage.label("previous_weight"),
+                )
+                .execution_options(synchronize_session=False),
+            )
+            results.update({
+                row.id: BatchItemResult(id=row.id, status=BatchItemStatus.UPDATED, version=row.version)
+                for row in rows
+            })
+        return await PerformanceStandardService._finish_batch(
+            db, ids, results, rows, atomic,
+            check_weights=any(row.weight_percentage > row.previous_weight for row in rows),
+        )
+
+    @staticmethod
+    async def delete_performance_standards_batch(
+        db: AsyncSession,
+        items: List[BatchDeleteItem],
+        user_id: str,
+        atomic: bool = False,
+    ) -> Dict[str, Any]:
+        ids = [item.id for item in items]
+        check_batch(ids)
+        targets = batch_values("targets", [], [(item.id, item.version) for item in items])
+        rows = await PerformanceStandardService._execute_all(
+            db,
+            update(PerformanceStandards)
+            .where(*target_rows(PerformanceStandards, targets))
+            .values(deleted_at=func.now(), updated_by=user_id, version=PerformanceStandards.version + 1)
+            .returning(PerformanceStandards.id, PerformanceStandards.version, PerformanceStandards.category_id)
+            .execution_options(synchronize_session=False),
+        )
+        results = {
+            row.id: BatchItemResult(id=row.id, status=BatchItemStatus.DELETED, version=row.version)
+            for row in rows
+        }
+        return await PerformanceStandardService._finish_batch(db, ids, results, rows, atomic)
+
+    @staticmethod
+    async def import_performance_standards(
+        db: AsyncSession,
+        rows: AsyncIterator[Any],
+        user_id: str,
+        dry_run: bool = False,
+        skip_invalid: bool = False,
+    ) -> Dict[str, Any]:
+        valid: List[Tuple[int, PerformanceStandardsAdd]] = []
+        errors: List[Dict[str, Any]] = []
+        total_rows = 0
+
+        async for row in rows:
+            total_rows += 1
+            if total_rows > settings.import_max_rows:
+                raise APIException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    message=f"Import is limited to {settings.import_max_rows} rows",
+                )
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                valid.append((total_rows, PerformanceStandardsAdd.model_validate(_normalize_import_row(row))))
+            except ValidationError as e:
+                errors.append({
+                    "row": total_rows,
+                    "errors": [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()],
+                })
+            except ValueError as e:
+                errors.append({"row": total_rows, "errors": [f"invalid row: {e}"]})
+
+        # Satu query untuk semua kategori dan satu query untuk semua nama yang sudah ada
+        category_ids = {data.category_id for _, data in valid}
+        known_categories = set()
+        existing_names = set()
+        if category_ids:
+            known_categories = set((await db.scalars(
+                select(ActivityCategories.id).where(
+                    ActivityCategories.id.in_(list(category_ids)),
+                    ActivityCategories.deleted_at.is_(None),
+                )
+            )).all())
+            existing_names = set((await db.execute(
+                select(PerformanceStandards.category_id, func.lower(PerformanceStandards.name)).where(
+                    PerformanceStandards.category_id.in_(list(category_ids)),
+                    func.lower(PerformanceStandards.name).in_(list({data.name.lower() for _, data in valid})),
+                    PerformanceStandards.deleted_at.is_(None),
+                )
+            )).all())
+
+        to_insert: List[Dict[str, Any]] = []
+        seen = set()
+        for row_number, data in valid:
+            key = (data.category_id, data.name.lower())
+            if data.category_id not in known_categories:
+                errors.append({"row": row_number, "errors": ["category_id: Activity category not found"]})
+            elif key in existing_names:
+                errors.append({"row": row_number, "errors": ["name: Performance standards name already exists in this category"]})
+            elif key in seen:
+                errors.append({"row": row_number, "errors": ["name: Duplicate name for this category within the import"]})
+            else:
+                seen.add(key)
+                to_insert.append({
+                    "name": data.name,
+                    "category_id": data.category_id,
+                    "description": data.description,
+                    "evaluation_method": data.evaluation_method.value,
+                    "scoring_rules": data.scoring_rules,
+                    "evaluation_guide": data.evaluation_guide,
+                    "weight_percentage": data.weight_percentage,
+                    "created_by": user_id,
+                    "updated_by": user_id,
+                })
+        errors.sort(key=lambda e: e["row"])
+
+        inserted = 0
+        if not dry_run and to_insert and (skip_invalid or not errors):
+            batch_size = settings.import_batch_size
+            try:
+                for start in range(0, len(to_insert), batch_size):
+                    await db.execute(insert(PerformanceStandards), to_insert[start:start + batch_size])
+            except IntegrityError as e:
+                # Add/import paralel bisa lolos pre-check nama lebih dulu
+                await db.rollback()
+                raise PerformanceStandardService._map_integrity_error(e)
+            await PerformanceStandardService._commit(
+                db, *{row["category_id"] for row in to_insert}, check_weights=True,
+            )
+            inserted = len(to_insert)
+
+        return {
+            "dry_run": dry_run,
+            "total_rows": total_rows,
+            "valid_rows": len(to_insert),
+            "invalid_rows": len(errors),
+            "inserted": inserted,
+            "errors": errors,
+        }
+
+    @staticmethod
+    async def export_performance_standards(
+        category_id: Optional[str] = None,
+    ) -> AsyncIterator[List[PerformanceStandardsResponse]]:
+        """Batch baris hidup lewat server-side cursor; memakai session sendiri karena
+        dibaca sepanjang StreamingResponse, setelah dependency request selesai."""
+        query = select(PerformanceStandards).where(PerformanceStandards.deleted_at.is_(None))
+        if category_id:
+            query = query.where(PerformanceStandards.category_id == category_id)
+        query = query.order_by(PerformanceStandards.name, PerformanceStandards.id).execution_options(
+            yield_per=settings.export_batch_size,
+        )
+        async with AsyncSessionLocal() as db:
+            result = await db.stream_scalars(query)
+            async for partition in result.partitions():
+                yield [PerformanceStandardsResponse.model_validate(r) for r in partition]
+                db.expunge_all()
+
+
+def _normalize_import_row(row: Any) -> Dict[str, Any]:
+    """Baris CSV datang sebagai string: kosong berarti None, scoring_rules berupa JSON."""
+    if not isinstance(row, dict):
+        raise ValueError("row must be an object")
+    normalized = {key: (None if value == "" else value) for key, value in row.items() if key}
+    if isinstance(normalized.get("scoring_rules"), str):
+        normalized["scoring_rules"] = json.loads(normalized["scoring_rules"])
+    return normalized
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,7 @@ class ActivityCategoriesAdd(ActivityCategoriesBase):
 class ActivityCategoriesUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=150, example="test")
     is_active: Optional[bool] = None
+    version: Optional[int] = Field(None, description="Expected version; If-Match header takes precedence", example=1)
 
     model_config = {"from_attributes": True}
 
@@ -28,3 +29,31 @@ class ActivityCategoriesResponse(ActivityCategoriesBase):
     updated_at: datetime
     created_by: str
     updated_by: str
+    version: int
+
+
+class ActivityCategoriesListItem(BaseModel):
+    id: UUID
+    name: str
+    is_active: bool
+
+    model_config = {"from_attributes": True}
+
+
+class CategoryWeightSummary(BaseModel):
+    id: UUID
+    name: str
+    is_active: bool
+    weight_total: float
+    standards_count: int
+    is_complete: bool
+
+    model_config = {"from_attributes": True}
+
+
+class ActivityCategoriesBatchUpdateItem(ActivityCategoriesUpdate):
+    id: UUID = Field(..., example="59e89eac-b42e-4a19-b220-a7dad5fc3dc9")
+
+
+class ActivityCategoriesBatchUpdate(BaseModel):
+    items: List[ActivityCategoriesBatchUpdateItem] = Field(..., min_length=1)
@@ -0,0 +1,14 @@
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel, Field, model_validator
+
+
+class ArchiveRestoreRequest(BaseModel):
+    category_ids: List[UUID] = Field(default_factory=list, example=["59e89eac-b42e-4a19-b220-a7dad5fc3dc9"])
+    standard_ids: List[UUID] = Field(default_factory=list, example=[])
+
+    @model_validator(mode="after")
+    def _not_empty(self) -> "ArchiveRestoreRequest":
+        if not self.category_ids and not self.standard_ids:
+            raise ValueError("category_ids or standard_ids is required")
+        return self
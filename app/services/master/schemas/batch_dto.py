@@ -0,0 +1,28 @@
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class BatchItemStatus(str, Enum):
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
+
+
+class BatchItemResult(BaseModel):
+    id: UUID
+    status: BatchItemStatus
+    version: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchDeleteItem(BaseModel):
+    id: UUID = Field(..., example="59e89eac-b42e-4a19-b220-a7dad5fc3dc9")
+    version: Optional[int] = Field(None, description="Expected version; stale rows are reported as conflict", example=1)
+
+
+class BatchDeleteRequest(BaseModel):
+    items: List[BatchDeleteItem] = Field(..., min_length=1)
@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Optional, Any
+from typing import Any, List, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from enum import Enum
 
+from app.services.scoring.rules import compile_rule
+
 class PerformanceStandardsEvaluationMethod(str, Enum):
     MANUAL = "MANUAL"
     SYSTEM = "SYSTEM"
@@ -20,7 +22,14 @@ class PerformanceStandardsBase(BaseModel):
     model_config = {"from_attributes": True}
 
 class PerformanceStandardsAdd(PerformanceStandardsBase):
-    pass
+    @model_validator(mode="after")
+    def _validate_scoring_rules(self) -> "PerformanceStandardsAdd":
+        # Rule SYSTEM harus bisa dikompilasi saat disimpan, bukan saat dinilai
+        if self.evaluation_method == PerformanceStandardsEvaluationMethod.SYSTEM:
+            if self.scoring_rules is None:
+                raise ValueError("scoring_rules is required when evaluation_method is SYSTEM")
+            compile_rule(self.scoring_rules)
+        return self
 
 class PerformanceStandardsUpdate(BaseModel):
     category_id: Optional[UUID] = Field(None, example="59e89eac-b42e-4a19-b220-a7dad5fc3dc9")
@@ -30,11 +39,29 @@ class PerformanceStandardsUpdate(BaseModel):
     scoring_rules: Optional[Any] = Field(None, example={"rule": "value"})
     evaluation_guide: Optional[str] = Field(None, example="Panduan Penilaian PM")
     weight_percentage: Optional[float] = Field(None, example=10.0)
+    version: Optional[int] = Field(None, description="Expected version; If-Match header takes precedence", example=1)
 
     model_config = {"from_attributes": True}
 
+class PerformanceStandardsBatchUpdateItem(BaseModel):
+    # Tanpa category_id: batch tidak memindahkan standar antar kategori
+    id: UUID = Field(..., example="59e89eac-b42e-4a19-b220-a7dad5fc3dc9")
+    name: Optional[str] = Field(None, min_length=1, max_length=150, example="Nama Standar")
+    description: Optional[str] = Field(None, example="Deskripsi Standar")
+    evaluation_method: Optional[PerformanceStandardsEvaluationMethod] = Field(None, example="MANUAL")
+    scoring_rules: Optional[Any] = Field(None, example={"rule": "value"})
+    evaluation_guide: Optional[str] = Field(None, example="Panduan Penilaian PM")
+    weight_percentage: Optional[float] = Field(None, example=10.0)
+    version: Optional[int] = Field(None, description="Expected version; stale rows are reported as conflict", example=1)
+
+    model_config = {"extra": "forbid"}
+
+class PerformanceStandardsBatchUpdate(BaseModel):
+    items: List[PerformanceStandardsBatchUpdateItem] = Field(..., min_length=1)
+
 class PerformanceStandardsResponse(PerformanceStandardsBase):
     id: UUID
     created_by: Optional[str]
     created_at: datetime
     updated_at: Optional[datetime]
+    version: int
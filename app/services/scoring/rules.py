@@ -0,0 +1,213 @@
+"""DSL `scoring_rules` untuk standar dengan `evaluation_method=SYSTEM`.
+
+Bentuk rule (JSON):
+
+- threshold: ``{"type": "threshold", "metric": "tasks_done",
+  "thresholds": [{"min": 5, "score": 70}, {"min": 10, "score": 100}], "default": 0}``
+  skor dari `min` terbesar yang <= nilai metric.
+- range: ``{"type": "range", "metric": "hours",
+  "ranges": [{"min": 0, "max": 4, "score": 50}, {"min": 4, "score": 100}], "default": 0}``
+  `min` inklusif, `max` eksklusif, band tidak boleh tumpang tindih.
+- weighted: ``{"type": "weighted", "terms": [
+  {"metric": "tasks_done", "target": 10, "weight": 0.6},
+  {"rule": {...}, "weight": 0.4}]}``
+  rata-rata berbobot; term metric bernilai min(nilai / target, 1) * 100.
+
+Rule divalidasi sekali lalu dikompilasi menjadi fungsi NumPy yang menilai
+seluruh batch sekaligus.
+"""
+from typing import Annotated, Any, Callable, Dict, FrozenSet, List, Literal, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, model_validator
+
+MAX_RULE_DEPTH = 4
+
+Columns = Dict[str, np.ndarray]
+
+
+class RuleError(ValueError):
+    pass
+
+
+class _RuleModel(BaseModel):
+    model_config = {"extra": "forbid"}
+
+
+class ThresholdStep(_RuleModel):
+    min: float
+    score: float
+
+
+class ThresholdRule(_RuleModel):
+    type: Literal["threshold"]
+    metric: str = Field(..., min_length=1)
+    thresholds: List[ThresholdStep] = Field(..., min_length=1)
+    default: float = 0
+
+    @model_validator(mode="after")
+    def _unique_mins(self) -> "ThresholdRule":
+        mins = [step.min for step in self.thresholds]
+        if len(set(mins)) != len(mins):
+            raise ValueError("threshold min values must be unique")
+        return self
+
+
+class RangeBand(_RuleModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    score: float
+
+    @model_validator(mode="after")
+    def _bounds(self) -> "RangeBand":
+        if self.min is None and self.max is None:
+            raise ValueError("range needs min, max or both")
+        if self.min is not None and self.max is not None and self.min >= self.max:
+            raise ValueError("range min must be lower than max")
+        return self
+
+
+class RangeRule(_RuleModel):
+    type: Literal["range"]
+    metric: str = Field(..., min_length=1)
+    ranges: List[RangeBand] = Field(..., min_length=1)
+    default: float = 0
+
+    @model_validator(mode="after")
+    def _no_overlap(self) -> "RangeRule":
+        bands = sorted(self.ranges, key=lambda b: -np.inf if b.min is None else b.min)
+        for prev, band in zip(bands, bands[1:]):
+            prev_max = np.inf if prev.max is None else prev.max
+            band_min = -np.inf if band.min is None else band.min
+            if band_min < prev_max:
+                raise ValueError("ranges must not overlap")
+        return self
+
+
+class WeightedTerm(_RuleModel):
+    weight: float = Field(..., gt=0)
+    metric: Optional[str] = Field(None, min_length=1)
+    target: Optional[float] = Field(None, gt=0)
+    rule: Optional["Rule"] = None
+
+    @model_validator(mode="after")
+    def _one_source(self) -> "WeightedTerm":
+        if (self.metric is None) == (self.rule is None):
+            raise ValueError("term needs exactly one of metric or rule")
+        if self.metric is not None and self.target is None:
+            raise ValueError("metric term needs a target")
+        return self
+
+
+class WeightedRule(_RuleModel):
+    type: Literal["weighted"]
+    terms: List[WeightedTerm] = Field(..., min_length=1)
+
+
+Rule = Annotated[Union[ThresholdRule, RangeRule, WeightedRule], Field(discriminator="type")]
+WeightedTerm.model_rebuild()
+
+_rule_adapter: TypeAdapter[Rule] = TypeAdapter(Rule)
+
+
+class CompiledRule:
+    """Rule siap pakai: `rule(columns)` menerima array per metric, hasilnya array skor."""
+
+    __slots__ = ("metrics", "_fn")
+
+    def __init__(self, fn: Callable[[Columns], np.ndarray], metrics: FrozenSet[str]):
+        self._fn = fn
+        self.metrics = metrics
+
+    def __call__(self, columns: Mapping[str, ArrayLike]) -> np.ndarray:
+        arrays: Columns = {}
+        size = None
+        for metric in self.metrics:
+            if metric not in columns:
+                raise RuleError(f"missing metric '{metric}'")
+            values = np.asarray(columns[metric], dtype=np.float64)
+            if values.ndim != 1:
+                raise RuleError(f"metric '{metric}' must be a flat list of numbers")
+            if size is not None and values.shape[0] != size:
+                raise RuleError("all metrics must have the same number of values")
+            size = values.shape[0]
+            arrays[metric] = values
+        return self._fn(arrays)
+
+
+def parse_rule(data: Any) -> Rule:
+    try:
+        return _rule_adapter.validate_python(data)
+    except ValidationError as e:
+        raise RuleError("; ".join(
+            f"{'.'.join(str(p) for p in err['loc']) or 'rule'}: {err['msg']}" for err in e.errors()
+        )) from None
+
+
+def compile_rule(data: Any) -> CompiledRule:
+    fn, metrics = _compile(parse_rule(data), 1)
+    return CompiledRule(fn, metrics)
+
+
+def _compile(rule: Rule, depth: int) -> Tuple[Callable[[Columns], np.ndarray], FrozenSet[str]]:
+    if depth > MAX_RULE_DEPTH:
+        raise RuleError(f"rules can be nested at most {MAX_RULE_DEPTH} levels deep")
+    if isinstance(rule, ThresholdRule):
+        return _compile_threshold(rule), frozenset([rule.metric])
+    if isinstance(rule, RangeRule):
+        return _compile_range(rule), frozenset([rule.metric])
+    return _compile_weighted(rule, depth)
+
+
+def _compile_threshold(rule: ThresholdRule) -> Callable[[Columns], np.ndarray]:
+    steps = sorted(rule.thresholds, key=lambda s: s.min)
+    mins = np.array([s.min for s in steps])
+    scores = np.array([s.score for s in steps])
+    metric, default = rule.metric, rule.default
+
+    def score(columns: Columns) -> np.ndarray:
+        values = columns[metric]
+        idx = np.searchsorted(mins, values, side="right") - 1
+        return np.where((idx < 0) | np.isnan(values), default, scores[np.maximum(idx, 0)])
+
+    return score
+
+
+def _compile_range(rule: RangeRule) -> Callable[[Columns], np.ndarray]:
+    lows = [-np.inf if b.min is None else b.min for b in rule.ranges]
+    highs = [np.inf if b.max is None else b.max for b in rule.ranges]
+    scores = [b.score for b in rule.ranges]
+    metric, default = rule.metric, rule.default
+
+    def score(columns: Columns) -> np.ndarray:
+        values = columns[metric]
+        return np.select([(values >= lo) & (values < hi) for lo, hi in zip(lows, highs)], scores, default)
+
+    return score
+
+
+def _compile_weighted(rule: WeightedRule, depth: int) -> Tuple[Callable[[Columns], np.ndarray], FrozenSet[str]]:
+    parts: List[Tuple[float, Callable[[Columns], np.ndarray]]] = []
+    metrics: FrozenSet[str] = frozenset()
+    for term in rule.terms:
+        if term.rule is not None:
+            fn, term_metrics = _compile(term.rule, depth + 1)
+        else:
+            fn, term_metrics = _target_score(term.metric, term.target), frozenset([term.metric])
+        parts.append((term.weight, fn))
+        metrics |= term_metrics
+    total_weight = sum(weight for weight, _ in parts)
+
+    def score(columns: Columns) -> np.ndarray:
+        result = sum(weight * fn(columns) for weight, fn in parts)
+        return result / total_weight
+
+    return score, metrics
+
+
+def _target_score(metric: str, target: float) -> Callable[[Columns], np.ndarray]:
+    def score(columns: Columns) -> np.ndarray:
+        return np.clip(np.nan_to_num(columns[metric] / target), 0, 1) * 100
+
+    return score
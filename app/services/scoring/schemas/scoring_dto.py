@@ -0,0 +1,13 @@
+from typing import Dict, List
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class ScoreRequest(BaseModel):
+    standard_ids: List[UUID] = Field(..., min_length=1, example=["59e89eac-b42e-4a19-b220-a7dad5fc3dc9"])
+    metrics: Dict[str, List[float]] = Field(..., example={"tasks_done": [3, 8, 12], "hours": [2.5, 6, 7.5]})
+
+
+class ScoreResponse(BaseModel):
+    rows: int
+    scores: Dict[UUID, List[float]]
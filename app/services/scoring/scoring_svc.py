@@ -0,0 +1,122 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Mapping, Sequence
+from uuid import UUID
+
+import numpy as np
+from numpy.typing import ArrayLike
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import status
+
+from app.core.config import settings
+from app.models.performance_standards import PerformanceStandards, PerformanceStandardsEvaluationMethod
+from app.services.scoring.rules import CompiledRule, RuleError, compile_rule
+from app.utils.cache import TTLCache
+from app.utils.response.exception import APIException
+
+logger = logging.getLogger(__name__)
+
+# Key (id, updated_at): rule yang berubah otomatis punya key baru, entry lama tersingkir LRU
+_compiled_rules: TTLCache = TTLCache(
+    max_entries=settings.scoring_rule_cache_max_entries,
+    ttl_seconds=settings.scoring_rule_cache_ttl_seconds,
+)
+
+
+class ScoringService:
+    @staticmethod
+    def compile_standard(standard_id: UUID, updated_at: datetime, scoring_rules) -> CompiledRule:
+        key = (standard_id, updated_at)
+        rule = _compiled_rules.get(key)
+        if rule is None:
+            rule = compile_rule(scoring_rules)
+            _compiled_rules.set(key, rule)
+        return rule
+
+    @staticmethod
+    async def compiled_rules(db: AsyncSession, standard_ids: Sequence[UUID], strict: bool = True) -> Dict[UUID, CompiledRule]:
+        """`strict=False` melewati standar yang tidak ada, bukan SYSTEM, atau rule-nya rusak."""
+        ids = list(dict.fromkeys(standard_ids))
+        rows = (await db.execute(
+            select(PerformanceStandards.id, PerformanceStandards.updated_at, PerformanceStandards.evaluation_method).where(
+                PerformanceStandards.id.in_(ids),
+                PerformanceStandards.deleted_at.is_(None),
+            )
+        )).all()
+        if not strict:
+            rows = [row for row in rows if row.evaluation_method == PerformanceStandardsEvaluationMethod.SYSTEM]
+        found = {row.id: row for row in rows}
+        missing = [str(i) for i in ids if i not in found]
+        if missing and strict:
+            raise APIException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                message=f"Performance standards not found: {', '.join(missing)}",
+            )
+        manual = [str(row.id) for row in rows if row.evaluation_method != PerformanceStandardsEvaluationMethod.SYSTEM]
+        if manual:
+            raise APIException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=f"Performance standards are not SYSTEM-evaluated: {', '.join(manual)}",
+            )
+
+        compiled: Dict[UUID, CompiledRule] = {}
+        for row in rows:
+            rule = _compiled_rules.get((row.id, row.updated_at))
+            if rule is not None:
+                compiled[row.id] = rule
+        # JSON rule hanya diambil untuk standar yang belum ada di cache
+        to_compile = [row.id for row in rows if row.id not in compiled]
+        if to_compile:
+            sources = (await db.execute(
+                select(PerformanceStandards.id, PerformanceStandards.updated_at, PerformanceStandards.scoring_rules).where(
+                    PerformanceStandards.id.in_(to_compile),
+                )
+            )).all()
+            for source in sources:
+                try:
+                    compiled[source.id] = ScoringService.compile_standard(source.id, source.updated_at, source.scoring_rules)
+                except RuleError as e:
+                    if not strict:
+                        logger.warning("Skipping invalid scoring_rules on performance standard %s: %s", source.id, e)
+                        continue
+                    raise APIException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        message=f"Invalid scoring_rules on performance standard {source.id}: {e}",
+                    )
+        return compiled
+
+    @staticmethod
+    async def score(
+        db: AsyncSession,
+        standard_ids: Sequence[UUID],
+        metrics: Mapping[str, ArrayLike],
+    ) -> Dict[UUID, np.ndarray]:
+        lengths = {len(values) for values in metrics.values()}
+        if len(lengths) > 1:
+            raise APIException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="All metrics must have the same number of values",
+            )
+        if lengths and lengths.pop() > settings.scoring_max_rows:
+            raise APIException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                message=f"Scoring is limited to {settings.scoring_max_rows} rows per request",
+            )
+        columns = {name: np.asarray(values, dtype=np.float64) for name, values in metrics.items()}
+        rules = await ScoringService.compiled_rules(db, standard_ids)
+        try:
+            return {standard_id: rule(columns) for standard_id, rule in rules.items()}
+        except RuleError as e:
+            raise APIException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=str(e),
+            )
+
+    @staticmethod
+    def cache_stats() -> Dict:
+        return _compiled_rules.stats()
+
+
+def scores_to_lists(scores: Mapping[UUID, np.ndarray]) -> Dict[UUID, List[float]]:
+    return {standard_id: values.tolist() for standard_id, values in scores.items()}
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 
 class UserInfo(BaseModel):
@@ -7,6 +7,8 @@ class UserInfo(BaseModel):
     email: Optional[str] = None
     full_name: Optional[str] = None
     roles: List[str] = []
+    permission_mask: int = Field(0, exclude=True)
+    policy_version: int = Field(0, exclude=True)
 
 class ChangeProfileRequest(BaseModel):
     first_name: Optional[str] = None
@@ -3,8 +3,9 @@ from typing import Any, Dict
 
 from fastapi import status
 from keycloak import KeycloakPostError
+from starlette.concurrency import run_in_threadpool
 
-from app.core.clients import get_keycloak_admin
+from app.core.clients import call_keycloak_admin
 from app.services.user.schemas.profile import ChangeProfileRequest, ChangeProfileResponse
 from app.services.user.schemas.change_password import ChangePasswordRequest
 
@@ -12,22 +13,24 @@ from app.utils.response.exception import APIException
 
 class UserService:
     @staticmethod
-    def change_password(user_id: str, payload: ChangePasswordRequest) -> None:
+    async def change_password(user_id: str, payload: ChangePasswordRequest) -> None:
         if payload.new_password != payload.new_password_confirmation:
             raise APIException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 message="Konfirmasi password baru tidak sama"
             )
 
-        admin = get_keycloak_admin()
         try:
-            admin.set_user_password(
-                user_id=user_id,
-                password=payload.new_password,
-                temporary=False
+            await run_in_threadpool(
+                call_keycloak_admin,
+                lambda admin: admin.set_user_password(
+                    user_id=user_id,
+                    password=payload.new_password,
+                    temporary=False
+                ),
             )
             try:
-                admin.logout(user_id)
+                await run_in_threadpool(call_keycloak_admin, lambda admin: admin.logout(user_id))
             except Exception:
                 pass
 
@@ -44,11 +47,10 @@ class UserService:
             )
 
     @staticmethod
-    def update_profile(user_id: str, payload: ChangeProfileRequest) -> ChangeProfileResponse:
+    async def update_profile(user_id: str, payload: ChangeProfileRequest) -> ChangeProfileResponse:
         if payload.first_name is None and payload.last_name is None and payload.email is None:
             raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Tidak ada field yang diubah")
 
-        admin = get_keycloak_admin()
         body = {}
         if payload.first_name is not None:
             body["firstName"] = payload.first_name
@@ -60,9 +62,11 @@ class UserService:
 
         try:
             if body:
-                admin.update_user(user_id=user_id, payload=body)
+                await run_in_threadpool(
+                    call_keycloak_admin, lambda admin: admin.update_user(user_id=user_id, payload=body),
+                )
 
-            updated_user = admin.get_user(user_id)
+            updated_user = await run_in_threadpool(call_keycloak_admin, lambda admin: admin.get_user(user_id))
             first_name = updated_user.get("firstName") or updated_user.get("first_name")
             last_name = updated_user.get("lastName") or updated_user.get("last_name")
             email = updated_user.get("email")
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -25,5 +25,5 @@ class BaseModel(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     created_by = Column(String, nullable=True)
     updated_by = Column(String, nullable=True)
-
-    __mapper_args__ = {"eager_defaults": True}
+    # Naik 1 di setiap UPDATE; dipakai untuk optimistic concurrency (If-Match)
+    version = Column(Integer, nullable=False, server_default="1")
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU in-process dengan batas jumlah entry dan kedaluwarsa per entry.
+
+    `expires_at` (epoch detik) per entry bisa lebih cepat dari TTL default,
+    dipakai misalnya supaya cache token tidak melewati `exp` token itu sendiri.
+    Kalau `max_bytes` diisi, `weigher` dipakai untuk memperkirakan ukuran entry
+    dan entry paling lama tidak dipakai dibuang sampai total di bawah batas.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int = 0,
+        weigher: Optional[Callable[[V], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._weigher = weigher
+        self._data: "OrderedDict[K, Tuple[float, V, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        deadline = time.time() + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        weight = self._weigher(value) if self._weigher and self.max_bytes else 0
+        if self.max_bytes and weight > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (deadline, value, weight)
+            self._bytes += weight
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                _, (_, _, evicted_weight) = self._data.popitem(last=False)
+                self._bytes -= evicted_weight
+                self.evictions += 1
+
+    def _remove(self, key: K) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.max_bytes:
+            stats["bytes"] = self._bytes
+            stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+class ReadThroughCache(Generic[K, V]):
+    """`TTLCache` yang mengisi dirinya sendiri lewat loader async.
+
+    Setiap invalidasi menaikkan generasi; hasil loader yang mulai sebelum
+    invalidasi tidak disimpan, supaya data lama tidak masuk lagi ke cache
+    setelah sebuah write.
+    """
+
+    def __init__(self, cache: TTLCache[K, V]):
+        self.cache = cache
+        self._generation = 0
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = await loader()
+        if generation == self._generation:
+            self.cache.set(key, value)
+        return value
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        self._generation += 1
+        return self.cache.invalidate_where(predicate)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -0,0 +1,54 @@
+import codecs
+import csv
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import status
+
+from app.utils.response.exception import APIException
+
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+
+
+def is_csv(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in CSV_MEDIA_TYPES
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[Dict[str, Optional[str]]]:
+    """Baris CSV (dengan header) sebagai dict, dibaca per chunk tanpa memuat seluruh body.
+
+    Field ber-quote yang berisi newline ditahan sampai jumlah tanda kutip seimbang.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    header: Optional[List[str]] = None
+    pending = ""
+    record = ""
+
+    def parse(text: str):
+        nonlocal header
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            return None
+        if not any(v.strip() for v in values):
+            return None
+        return {key: (values[i] if i < len(values) else None) for i, key in enumerate(header)}
+
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                record = f"{record}\n{line}" if record else line
+                if record.count('"') % 2 == 0:
+                    row = parse(record.rstrip("\r"))
+                    record = ""
+                    if row is not None:
+                        yield row
+        pending += decoder.decode(b"", final=True)
+        tail = f"{record}\n{pending}" if record else pending
+        if tail.strip():
+            row = parse(tail.rstrip("\r\n"))
+            if row is not None:
+                yield row
+    except (UnicodeDecodeError, csv.Error):
+        raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Body bukan CSV UTF-8 yang valid")
@@ -0,0 +1,12 @@
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+
+def is_unique_violation(error: IntegrityError, constraint_name: str) -> bool:
+    return getattr(error.orig, "sqlstate", None) == "23505" and violated_constraint(error) == constraint_name
@@ -0,0 +1,65 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.response.exception import APIException
+
+# Versi tabel = jumlah baris (termasuk soft-deleted) + max(updated_at). Setiap
+# insert, update, soft delete dan purge mengubah salah satunya.
+_table_versions: TTLCache[str, str] = TTLCache(
+    max_entries=64,
+    ttl_seconds=settings.etag_version_ttl_seconds,
+)
+
+
+async def table_version(db: AsyncSession, model) -> str:
+    table_name = model.__tablename__
+    version = _table_versions.get(table_name)
+    if version is None:
+        row = (await db.execute(select(func.count(), func.max(model.updated_at)).select_from(model))).one()
+        version = f"{row[0]}:{row[1].timestamp() if row[1] else 0}"
+        _table_versions.set(table_name, version)
+    return version
+
+
+def invalidate_table_version(table_name: str) -> None:
+    _table_versions.delete(table_name)
+
+
+def make_etag(version: str, request: Request) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}|{version}".encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match memakai perbandingan weak: prefix W/ diabaikan
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def row_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Versi baris dari header If-Match (`"3"`, `W/"3"` atau `3`); kosong atau `*` berarti tanpa cek."""
+    if not if_match or if_match.strip() == "*":
+        return None
+    tag = if_match.split(",")[0].strip().removeprefix("W/").strip('"')
+    try:
+        return int(tag)
+    except ValueError:
+        raise APIException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message="If-Match must contain the row version returned in ETag",
+        )
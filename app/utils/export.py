@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, List, Sequence
+
+from pydantic import BaseModel
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def ndjson_chunks(batches: AsyncIterator[Sequence[BaseModel]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(item.model_dump_json().encode() + b"\n" for item in batch)
+
+
+async def csv_chunks(batches: AsyncIterator[Sequence[BaseModel]], fields: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for batch in batches:
+        for item in batch:
+            data = item.model_dump(mode="json")
+            writer.writerow([
+                json.dumps(data[field]) if isinstance(data[field], (dict, list)) else data[field]
+                for field in fields
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_chunks(batches: AsyncIterator[Sequence[BaseModel]], export_format: ExportFormat, fields: List[str]) -> AsyncIterator[bytes]:
+    if export_format == ExportFormat.CSV:
+        return csv_chunks(batches, fields)
+    return ndjson_chunks(batches)
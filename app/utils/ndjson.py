@@ -0,0 +1,53 @@
+import json
+from typing import Any, AsyncIterator
+
+from fastapi import Request, status
+
+from app.utils.response.exception import APIException
+
+NDJSON_MEDIA_TYPES = (
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+)
+
+
+def is_ndjson(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in NDJSON_MEDIA_TYPES
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def iter_request_rows(request: Request) -> AsyncIterator[Any]:
+    """Baris dari body JSON array atau stream NDJSON.
+
+    Baris NDJSON yang gagal di-parse di-yield sebagai `ValueError` supaya
+    pemanggil bisa melaporkannya per baris tanpa menghentikan stream.
+    """
+    if is_ndjson(request.headers.get("content-type", "")):
+        async for line in iter_lines(request.stream()):
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Body bukan JSON yang valid")
+    if not isinstance(body, list):
+        raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Body harus berupa JSON array")
+    for row in body:
+        yield row
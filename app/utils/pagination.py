@@ -0,0 +1,141 @@
+import base64
+import json
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import status
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.response.exception import APIException
+
+
+# Batas `limit` per halaman; dump seluruh katalog lewat endpoint export
+MAX_PAGE_LIMIT = 500
+
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    NONE = "none"
+
+
+# Satu cache per tabel supaya write cukup mengosongkan cache tabelnya sendiri
+_count_caches: Dict[str, TTLCache[Hashable, int]] = {}
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+    if not isinstance(values, dict):
+        raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Invalid cursor")
+    return values
+
+
+def keyset_page(
+    query: Select,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    limit: int,
+    sort_order: str,
+    cursor: Optional[str],
+) -> Select:
+    """Urutkan `query` dengan (sort_column, id) dan lanjutkan setelah `cursor`.
+
+    Mengambil `limit + 1` baris supaya `keyset_next_cursor` tahu masih ada halaman berikutnya.
+    """
+    descending = sort_order == "desc"
+    if cursor:
+        values = decode_cursor(cursor)
+        if values.get("o") != sort_order or "k" not in values or "id" not in values:
+            raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Cursor does not match sort order")
+        try:
+            last_id = UUID(str(values["id"]))
+        except ValueError:
+            raise APIException(status_code=status.HTTP_400_BAD_REQUEST, message="Invalid cursor")
+        key = tuple_(sort_column, id_column)
+        # Nilai cursor di-bind dengan tipe kolomnya; tanpa ini id terkirim sebagai varchar
+        # dan Postgres tidak punya operator uuid > varchar
+        after = tuple_(literal(values["k"], sort_column.type), literal(last_id, id_column.type))
+        query = query.where(key < after if descending else key > after)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    return query.limit(limit + 1)
+
+
+def keyset_next_cursor(
+    rows: Sequence[Any],
+    limit: int,
+    sort_order: str,
+    sort_attr: str,
+) -> Tuple[List[Any], Optional[str]]:
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor({"k": getattr(last, sort_attr), "id": str(last.id), "o": sort_order})
+
+
+def count_cache(table_name: str) -> TTLCache[Hashable, int]:
+    cache = _count_caches.get(table_name)
+    if cache is None:
+        cache = _count_caches.setdefault(
+            table_name,
+            TTLCache(
+                max_entries=settings.list_count_cache_max_entries,
+                ttl_seconds=settings.list_count_cache_ttl_seconds,
+            ),
+        )
+    return cache
+
+
+def invalidate_counts(table_name: str) -> None:
+    count_cache(table_name).clear()
+
+
+async def fetch_page(
+    db: AsyncSession,
+    filtered: Select,
+    page_query: Select,
+    total_mode: TotalMode,
+    table_name: str,
+    cache_key: Hashable,
+) -> Tuple[List[Any], Optional[int]]:
+    """Jalankan `page_query` dan hitung total baris `filtered` sesuai `total_mode`.
+
+    Mode `exact` menempelkan count sebagai scalar subquery di statement yang sama
+    sehingga halaman dan total didapat dalam satu round trip.
+    """
+    if total_mode == TotalMode.NONE:
+        return list((await db.scalars(page_query)).all()), None
+
+    cache = count_cache(table_name)
+    if total_mode == TotalMode.CACHED:
+        total = cache.get(cache_key)
+        if total is not None:
+            return list((await db.scalars(page_query)).all()), total
+
+    count_query = select(func.count()).select_from(filtered.order_by(None).subquery())
+    rows = (await db.execute(page_query.add_columns(count_query.scalar_subquery().label("total")))).all()
+    if rows:
+        total = rows[0].total
+    else:
+        total = await db.scalar(count_query)
+    if total_mode == TotalMode.CACHED:
+        cache.set(cache_key, total)
+    return [row[0] for row in rows], total
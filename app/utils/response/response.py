@@ -1,7 +1,10 @@
 from typing import Any, Dict, Optional, TypeVar, Generic, List
 import time
 from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from pydantic_core import to_json
 
 T = TypeVar("T")
 
@@ -9,15 +12,19 @@ T = TypeVar("T")
 class ResponseMeta(BaseModel):
     page: int = Field(1, description="Current page number")
     limit: int = Field(10, description="Number of items per page")
-    total: int = Field(0, description="Total number of items")
+    total: Optional[int] = Field(0, description="Total number of items")
+    total_mode: str = Field(
+        "exact", description="How total was produced: exact, cached or none"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (keyset pagination)"
+    )
     filter_applied: Optional[Dict[str, Any]] = Field(
         None, description="Applied filters"
     )
 
 
 class BaseResponse(BaseModel, Generic[T]):
-    model_config = {"ser_json_exclude_none": True}
-
     status_code: int = Field(..., description="HTTP status code")
     message: str = Field(..., description="Response message")
     timestamp: int = Field(
@@ -27,40 +34,76 @@ class BaseResponse(BaseModel, Generic[T]):
     data: Optional[T] = Field(None, description="Response data")
     meta: Optional[ResponseMeta] = Field(None, description="Response metadata")
 
+    def _omitted(self) -> Dict[str, Any]:
+        # Field kosong tidak ditulis, sama dengan bentuk envelope dict sebelumnya;
+        # meta.total tetap ditulis walau null (total_mode=none)
+        exclude: Dict[str, Any] = {}
+        if self.data is None:
+            exclude["data"] = True
+        if self.meta is None:
+            exclude["meta"] = True
+        else:
+            empty = {name for name in ("next_cursor", "filter_applied") if not getattr(self.meta, name)}
+            if empty:
+                exclude["meta"] = empty
+        return exclude
+
+    def to_json(self) -> bytes:
+        return self.__pydantic_serializer__.to_json(
+            self, exclude=self._omitted() or None, fallback=jsonable_encoder,
+        )
+
+
+class EnvelopeResponse(JSONResponse):
+    """Response default aplikasi: `BaseResponse` ditulis langsung oleh pydantic-core.
+
+    Route mengembalikan instance ini (lewat `success_response`/`paginated_response`)
+    sehingga FastAPI tidak menjalankan `jsonable_encoder` atas seluruh isi envelope;
+    header seperti ETag diteruskan lewat argumen `headers`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseResponse):
+            return content.to_json()
+        return to_json(content, fallback=jsonable_encoder)
+
 
 def success_response(
     data: Any = None,
     message: str = "Success",
     status_code: int = status.HTTP_200_OK,
-) -> Dict[str, Any]:
-    resp: Dict[str, Any] = {
-        "status_code": status_code,
-        "message": message,
-        "timestamp": int(time.time()),
-    }
-    if data is not None:
-        resp["data"] = data
-    return resp
+    headers: Optional[Dict[str, str]] = None,
+) -> EnvelopeResponse:
+    return EnvelopeResponse(
+        BaseResponse(status_code=status_code, message=message, data=data),
+        status_code=status_code,
+        headers=headers,
+    )
 
 
 def paginated_response(
     items: List[Any],
-    total: int,
+    total: Optional[int],
     page: int = 1,
     limit: int = 10,
     message: str = "Data retrieved successfully",
     filters: Optional[Dict[str, Any]] = None,
     status_code: int = status.HTTP_200_OK,
-) -> Dict[str, Any]:
+    next_cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    headers: Optional[Dict[str, str]] = None,
+) -> EnvelopeResponse:
     """Dipakai untuk list/search: menyertakan meta."""
-    meta: Dict[str, Any] = {"page": page, "limit": limit, "total": total}
-    if filters:
-        meta["filter_applied"] = filters
-
-    return {
-        "status_code": status_code,
-        "message": message,
-        "timestamp": int(time.time()),
-        "data": items,
-        "meta": meta,
-    }
+    meta = ResponseMeta(
+        page=page,
+        limit=limit,
+        total=total,
+        total_mode=total_mode,
+        next_cursor=next_cursor,
+        filter_applied=filters,
+    )
+    return EnvelopeResponse(
+        BaseResponse(status_code=status_code, message=message, data=items, meta=meta),
+        status_code=status_code,
+        headers=headers,
+    )
@@ -0,0 +1,10 @@
+from enum import Enum
+
+# Konfigurasi text search untuk kolom tsvector; konten campuran Indonesia/Inggris,
+# jadi tanpa stemming bahasa tertentu.
+SEARCH_CONFIG = "simple"
+
+
+class SearchMode(str, Enum):
+    SUBSTRING = "substring"
+    FULLTEXT = "fulltext"
@@ -0,0 +1,104 @@
+"""Micro-benchmark serialisasi envelope list: jalur dict lama vs `EnvelopeResponse`.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.envelope_serialization
+    python -m benchmarks.envelope_serialization --sizes 10 100 1000 --repeat 7
+
+Jalur lama meniru yang dilakukan FastAPI untuk dict yang dikembalikan route:
+`jsonable_encoder` atas seluruh envelope lalu `json.dumps` di `JSONResponse`.
+Jalur baru adalah `paginated_response` yang ditulis langsung oleh pydantic-core.
+Keduanya dibandingkan isinya (tanpa timestamp) sebelum diukur.
+"""
+import argparse
+import json
+import time
+import timeit
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.services.master.schemas.performance_standards_dto import PerformanceStandardsResponse
+from app.utils.response.response import paginated_response
+
+SCORING_RULES = {
+    "type": "threshold",
+    "metric": "commits",
+    "thresholds": [{"min": 1, "score": 50}, {"min": 5, "score": 80}, {"min": 10, "score": 100}],
+}
+
+
+def make_rows(size: int) -> List[PerformanceStandardsResponse]:
+    now = datetime.now(timezone.utc)
+    category_id = uuid.uuid4()
+    return [
+        PerformanceStandardsResponse(
+            id=uuid.uuid4(),
+            category_id=category_id,
+            name=f"Standar {i}",
+            description="Deskripsi standar penilaian kinerja " * 3,
+            evaluation_method="SYSTEM",
+            scoring_rules=SCORING_RULES,
+            evaluation_guide="Panduan penilaian PM",
+            weight_percentage=12.5,
+            created_by="benchmark",
+            created_at=now,
+            updated_at=now,
+            version=1,
+        )
+        for i in range(size)
+    ]
+
+
+def legacy_envelope(items: List[Any], total: int, page: int, limit: int) -> Dict[str, Any]:
+    # Bentuk dict yang dikembalikan `paginated_response` sebelum envelope bertipe
+    return {
+        "status_code": 200,
+        "message": "Data retrieved successfully",
+        "timestamp": int(time.time()),
+        "data": items,
+        "meta": {"page": page, "limit": limit, "total": total, "total_mode": "exact"},
+    }
+
+
+def old_path(items: List[PerformanceStandardsResponse]) -> bytes:
+    content = jsonable_encoder(legacy_envelope(items, len(items), 1, len(items)))
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def new_path(items: List[PerformanceStandardsResponse]) -> bytes:
+    return paginated_response(items=items, total=len(items), page=1, limit=len(items)).body
+
+
+def _without_timestamp(body: bytes) -> Dict[str, Any]:
+    data = json.loads(body)
+    data.pop("timestamp", None)
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds; the best round is reported")
+    parser.add_argument("--rows-per-round", type=int, default=20000, help="Rows serialized per round and path")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'old ms':>10} {'new ms':>10} {'speedup':>8} {'bytes':>9}")
+    for size in args.sizes:
+        items = make_rows(size)
+        old_body, new_body = old_path(items), new_path(items)
+        if _without_timestamp(old_body) != _without_timestamp(new_body):
+            raise SystemExit(f"Outputs differ for {size} rows")
+
+        number = max(1, args.rows_per_round // size)
+        old = min(timeit.repeat(lambda: old_path(items), number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(lambda: new_path(items), number=number, repeat=args.repeat)) / number
+        print(f"{size:>6} {old * 1000:>10.3f} {new * 1000:>10.3f} {old / new:>7.1f}x {len(new_body):>9}")
+
+
+if __name__ == "__main__":
+    main()
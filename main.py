@@ -1,3 +1,6 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -8,19 +11,53 @@ from app.routers.user import router as user_router
 from app.routers.activity_categories import router as activity_categories_router
 from app.routers.performance_standards import router as performance_standards_router
 from app.routers.test import router as test_router
+from app.routers.system import router as system_router
+from app.routers.activity import router as activity_router
 
-from app.core.database import engine, Base, SessionLocal
+from app.core.clients import close_async_keycloak, get_jwks_cache
+from app.core.config import settings
+from app.core.database import async_engine, engine, Base, SessionLocal
+from app.services.activity.ingest_buffer import activity_buffer
+from app.services.activity.rollup_svc import rollup_job
+from app.services.master.archive_svc import archive_job
 from app.utils.response.exception import (
     APIException,
     api_exception_handler,
     http_exception_handler,
     validation_exception_handler,
 )
+from app.utils.response.response import EnvelopeResponse
+
+logger = logging.getLogger(__name__)
 
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.keycloak_token_verification == "local" and not settings.keycloak_jwks:
+        try:
+            await get_jwks_cache().prefetch()
+        except Exception as e:
+            logger.warning("JWKS prefetch failed, keys will be fetched on first request: %s", e)
+    activity_buffer.start()
+    if settings.activity_rollup_mode == "job":
+        rollup_job.start()
+    archive_job.start()
+    yield
+    await activity_buffer.stop()
+    await rollup_job.stop()
+    await archive_job.stop()
+    await close_async_keycloak()
+    await async_engine.dispose()
+
+
 app = FastAPI(
-    title="PRODUCTIVITY TRACKER API", description="PRODUCTIVITY TRACKER", version="0.0.1"
+    title="PRODUCTIVITY TRACKER API",
+    description="PRODUCTIVITY TRACKER",
+    version="0.0.1",
+    lifespan=lifespan,
+    default_response_class=EnvelopeResponse,
 )
 
 app.add_exception_handler(APIException, api_exception_handler)
@@ -40,6 +77,8 @@ app.include_router(user_router, tags=["user"])
 app.include_router(activity_categories_router, tags=["master"])
 app.include_router(performance_standards_router, tags=["master"])
 app.include_router(test_router, tags=["test"])
+app.include_router(system_router, tags=["system"])
+app.include_router(activity_router, tags=["activity"])
 
 @app.get("/")
 async def root():